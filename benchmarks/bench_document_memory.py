@@ -0,0 +1,119 @@
+"""
+Peak memory benchmark for document storage in the landscape analysis
+
+Compares the previous dict-based layout (documents + processed_docs dicts,
+corpus-wide joins in the report) with DocumentTable records, in memory and
+spilled to disk. Each layout runs in its own process so peak RSS is not
+shared between runs.
+
+Usage:
+    python benchmarks/bench_document_memory.py [n_docs] [words_per_doc]
+"""
+
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+N_DOCS = 10000
+WORDS_PER_DOC = 2000
+MODES = ['dicts', 'records', 'records_spilled']
+POLICY_TERMS = ['regulation', 'policy', 'governance', 'fairness', 'bias', 'trust']
+
+
+def make_text(rng, vocabulary, n_words):
+    return ' '.join(rng.choice(vocabulary) for _ in range(n_words))
+
+
+def preprocess(text):
+    # Stand-in for TextPreprocessor: produces a new, shorter string
+    return ' '.join(w for w in text.lower().split() if len(w) > 3)
+
+
+def run_dicts(n_docs, n_words, rng, vocabulary):
+    """Layout used before DocumentTable."""
+    documents = []
+    for i in range(n_docs):
+        text = make_text(rng, vocabulary, n_words)
+        documents.append({
+            'filename': f"doc_{i}.pdf",
+            'text': text,
+            'word_count': len(text.split()),
+            'char_count': len(text)
+        })
+    processed_docs = []
+    for doc in documents:
+        processed = preprocess(doc['text'])
+        processed_docs.append({
+            'filename': doc['filename'],
+            'original_text': doc['text'],
+            'processed_text': processed,
+            'word_count': len(processed.split())
+        })
+    all_words = []
+    for doc in processed_docs:
+        all_words.extend(doc['processed_text'].split())
+    Counter(all_words)
+    all_text_lower = ' '.join([doc['processed_text'] for doc in processed_docs]).lower()
+    return sum(all_text_lower.count(term) for term in POLICY_TERMS)
+
+
+def run_records(n_docs, n_words, rng, vocabulary, spill):
+    """Layout used by LandscapeAnalyzer now."""
+    from document_store import DocumentTable
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = DocumentTable(Path(tmp) if spill else None)
+        for i in range(n_docs):
+            documents.add(f"doc_{i}.pdf", make_text(rng, vocabulary, n_words))
+        for doc in documents:
+            doc.processed_text = preprocess(doc.text)
+        word_freq = Counter()
+        for doc in documents:
+            word_freq.update(doc.processed_text.split())
+        count = 0
+        for doc in documents:
+            text_lower = doc.processed_text.lower()
+            count += sum(text_lower.count(term) for term in POLICY_TERMS)
+        documents.close()
+        return count
+
+
+def run_mode(mode, n_docs, n_words):
+    rng = random.Random(42)
+    vocabulary = [f"term{i:05d}" for i in range(20000)] + POLICY_TERMS
+    if mode == 'dicts':
+        run_dicts(n_docs, n_words, rng, vocabulary)
+    else:
+        run_records(n_docs, n_words, rng, vocabulary, spill=(mode == 'records_spilled'))
+    # ru_maxrss is in KiB on Linux
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main():
+    n_docs = int(sys.argv[1]) if len(sys.argv) > 1 else N_DOCS
+    n_words = int(sys.argv[2]) if len(sys.argv) > 2 else WORDS_PER_DOC
+
+    print(f"Peak RSS for {n_docs:,} documents x {n_words:,} words\n")
+    baseline = None
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, str(n_docs), str(n_words)],
+            capture_output=True, text=True, check=True
+        )
+        peak_mb = int(result.stdout.strip().splitlines()[-1]) / 1024
+        if baseline is None:
+            baseline = peak_mb
+        print(f"  {mode:<16} {peak_mb:8.1f} MB  ({peak_mb / baseline:.0%} of dicts)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--mode':
+        run_mode(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    else:
+        main()
@@ -0,0 +1,115 @@
+"""
+Offline throughput and resilience benchmark for the downloaders
+
+Starts benchmarks/mock_server.py in-process, writes a matching catalog into
+a temporary working directory and runs a downloader against it, then
+reports publications per minute, bytes per second and retries. The mixed
+workload includes slow bodies, 429/503 responses, HTML served as a PDF and
+publisher pages that have to be scraped.
+
+Usage:
+    python benchmarks/bench_downloads.py [--downloader enhanced|simple]
+        [--publications 40] [--hosts 4] [--workers 8] [--host-delay 1.5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import download_pdfs
+import download_pdfs_enhanced
+import obtain_publications
+from rate_limiter import RateLimiter
+
+from mock_server import LISTING_PATH, MockScenario, build_catalog, start_servers, write_catalog
+
+
+def run_downloader(name, workers):
+    """Run a downloader's main() in the current directory, returning (seconds, output)."""
+    module = download_pdfs_enhanced if name == 'enhanced' else download_pdfs
+    argv = ['bench', '--workers', str(workers)] if name == 'enhanced' else ['bench']
+    output = io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = argv
+    start = time.monotonic()
+    try:
+        with contextlib.redirect_stdout(output):
+            module.main()
+    finally:
+        sys.argv = saved_argv
+    return time.monotonic() - start, output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline downloader benchmark")
+    parser.add_argument('--downloader', choices=['enhanced', 'simple'], default='enhanced')
+    parser.add_argument('--publications', type=int, default=40)
+    parser.add_argument('--hosts', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=download_pdfs_enhanced.MAX_WORKERS)
+    parser.add_argument('--host-delay', type=float, default=download_pdfs_enhanced.PER_HOST_DELAY,
+                        help="seconds between requests to one mock host")
+    parser.add_argument('--port', type=int, default=8200)
+    args = parser.parse_args()
+
+    scenario = MockScenario()
+    bases = start_servers(scenario, args.port, args.hosts)
+    rows = build_catalog(scenario, bases, args.publications)
+
+    # download_pdfs.py goes through the enhanced module's limiter as well
+    limiter = RateLimiter(rate=1 / args.host_delay,
+                          max_concurrent=download_pdfs_enhanced.PER_HOST_CONCURRENCY)
+    download_pdfs_enhanced.RATE_LIMITER = limiter
+    obtain_publications.RATE_LIMITER = RateLimiter(rate=1 / args.host_delay)
+
+    workdir = tempfile.TemporaryDirectory()
+    cwd = os.getcwd()
+    os.chdir(workdir.name)
+    try:
+        start = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            listed = obtain_publications.scrape_publications(bases[0] + LISTING_PATH)
+        scrape_seconds = time.monotonic() - start
+
+        write_catalog(rows, "ai_watch_publications.csv")
+        # Counters are cumulative; the listing scrape is not part of the download run
+        requests_before = scenario.requests
+        bytes_before = scenario.bytes_sent
+        statuses_before = dict(scenario.statuses)
+        elapsed, output = run_downloader(args.downloader, args.workers)
+        pdf_bytes = sum(p.stat().st_size for p in Path("humaint_pdfs").glob("*.pdf"))
+        pdf_count = len(list(Path("humaint_pdfs").glob("*.pdf")))
+    finally:
+        os.chdir(cwd)
+        workdir.cleanup()
+
+    summary = output[output.find("DOWNLOAD SUMMARY"):].splitlines()[2:]
+    statuses = {status: count - statuses_before.get(status, 0)
+                for status, count in scenario.statuses.items()}
+    served_bytes = scenario.bytes_sent - bytes_before
+    print(f"Listing: {len(listed)} publications scraped in {scrape_seconds:.2f}s")
+    workers = f"{args.workers} workers" if args.downloader == 'enhanced' else "sequential"
+    print(f"Downloader: {args.downloader} ({workers}), "
+          f"{args.hosts} hosts, {args.host_delay}s per-host delay\n")
+    for line in summary:
+        if line.strip() and not line.startswith("PDFs saved to"):
+            print(f"  {line}")
+    print()
+    print(f"Publications per minute:  {len(rows) / elapsed * 60:.1f}")
+    print(f"PDFs saved:               {pdf_count} ({pdf_bytes:,} bytes)")
+    print(f"Throughput:               {pdf_bytes / elapsed / 1024:.0f} KiB/s saved, "
+          f"{served_bytes / elapsed / 1024:.0f} KiB/s served")
+    print(f"Requests served:          {scenario.requests - requests_before} "
+          f"({', '.join(f'{k}: {v}' for k, v in sorted(statuses.items()) if v)})")
+    print(f"Retries:                  {limiter.retries} ({limiter.throttled} throttled)")
+    print(f"Elapsed:                  {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+PDF-link discovery benchmark on saved publisher pages
+
+Compares the previous resolver (full BeautifulSoup tree with html.parser,
+then find_all('a') twice) with find_pdf_url, which scans the <head> as the
+page streams in and falls back to a <meta>/<a>-only parse. Both must return
+the same link for every fixture in benchmarks/fixtures.
+
+Usage:
+    python benchmarks/bench_html_resolver.py [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from download_pdfs_enhanced import HTML_CHUNK_SIZE, HTML_PARSER, find_pdf_url
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+BASE_URL = "https://publisher.example/article/1"
+REPEATS = 50
+
+
+def legacy_find_pdf_url(html, base_url):
+    """Resolver used before find_pdf_url (body of the old extract_pdf_from_page)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for meta in soup.find_all('meta'):
+        if meta.get('name') == 'citation_pdf_url' or meta.get('property') == 'citation_pdf_url':
+            pdf_url = meta.get('content')
+            if pdf_url:
+                return requests.compat.urljoin(base_url, pdf_url)
+    for a in soup.find_all('a', href=True):
+        href = a.get('href')
+        if href.lower().endswith('.pdf'):
+            return requests.compat.urljoin(base_url, href)
+    pdf_patterns = [
+        'download pdf', 'pdf download', 'download article',
+        'full text pdf', 'view pdf', 'get pdf', 'pdf full-text'
+    ]
+    for a in soup.find_all('a', href=True):
+        text = a.get_text(strip=True).lower()
+        if any(pattern in text for pattern in pdf_patterns):
+            href = a.get('href')
+            if href and 'pdf' in href.lower():
+                return requests.compat.urljoin(base_url, href)
+    return None
+
+
+def chunked(html, consumed):
+    """Yield the page in network-sized chunks, counting what was read."""
+    for i in range(0, len(html), HTML_CHUNK_SIZE):
+        chunk = html[i:i + HTML_CHUNK_SIZE]
+        consumed[0] += len(chunk)
+        yield chunk
+
+
+def timed(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    return result, (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS
+    fixtures = sorted(FIXTURES.glob('*.html'))
+    if not fixtures:
+        print(f"No fixtures in {FIXTURES}")
+        return
+
+    print(f"Fallback parser: {HTML_PARSER}, {repeats} repeats\n")
+    print(f"{'fixture':<28} {'size':>7} {'read':>7} {'legacy ms':>10} {'fast ms':>8} {'speedup':>8}")
+    total_legacy = total_fast = 0.0
+    for path in fixtures:
+        html = path.read_text(encoding='utf-8')
+        consumed = [0]
+        legacy, legacy_ms = timed(lambda: legacy_find_pdf_url(html, BASE_URL), repeats)
+        fast, fast_ms = timed(lambda: find_pdf_url(chunked(html, consumed), BASE_URL), repeats)
+        if legacy != fast:
+            print(f"MISMATCH in {path.name}: {legacy!r} != {fast!r}")
+            sys.exit(1)
+        total_legacy += legacy_ms
+        total_fast += fast_ms
+        print(f"{path.name:<28} {len(html) // 1024:>5}KB {consumed[0] // repeats // 1024:>5}KB "
+              f"{legacy_ms:>10.2f} {fast_ms:>8.2f} {legacy_ms / fast_ms:>7.1f}x")
+
+    print(f"\n{'total':<44} {total_legacy:>10.2f} {total_fast:>8.2f} "
+          f"{total_legacy / total_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Scriptable local stand-in for ai-watch.ec.europa.eu and publisher sites
+
+Serves a publications listing, PDFs, publisher pages built from
+benchmarks/fixtures, and scripted misbehaviour (latency, 429/503 with or
+without Retry-After, slow bodies, HTML served in place of a PDF) so the
+scraper and downloaders can be exercised offline. Every port runs the same
+routes; spreading a catalog over several ports gives each entry its own
+"host" for the per-host rate limiter.
+
+Usage:
+    python benchmarks/mock_server.py [--port 8200] [--hosts 4] [--publications 40]
+"""
+
+import argparse
+import csv
+import hashlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from download_pdfs_enhanced import find_pdf_url
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+LISTING_PATH = "/humaint/publications_en"
+BODY_CHUNK = 16 * 1024
+SURNAMES = ['Gomez', 'Tolan', 'Miron', 'Charisi', 'Pesole', 'Hupont', 'Escobar', 'Vinuesa']
+TOPICS = ['Trust', 'Robots', 'Children', 'Emotion', 'Fairness', 'Attention', 'Privacy',
+          'Learning', 'Autonomy', 'Labour', 'Empathy', 'Speech', 'Vision']
+
+
+def make_pdf_bytes(size, seed):
+    """Deterministic PDF-shaped body of roughly `size` bytes."""
+    filler = hashlib.sha256(seed.encode()).hexdigest().encode() * (size // 64 + 1)
+    return b'%PDF-1.4\n%mock\n' + filler[:max(size - 24, 0)] + b'\n%%EOF\n'
+
+
+class Route:
+    """
+    Scripted behaviour of one path.
+
+    `body` and `content_type` are what a successful request returns.
+    The first `fail_times` requests get `fail_status` (with Retry-After if
+    `retry_after` is set); `latency` delays every response and
+    `bytes_per_second` throttles the body.
+    """
+
+    def __init__(self, body, content_type='application/pdf', latency=0.0,
+                 bytes_per_second=None, fail_status=429, fail_times=0, retry_after=None):
+        self.body = body
+        self.content_type = content_type
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.fail_status = fail_status
+        self.fail_times = fail_times
+        self.retry_after = retry_after
+        self.hits = 0
+
+
+class MockScenario:
+    """Routes shared by every mock host, plus request and byte counters."""
+
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.statuses = {}
+
+    def add(self, path, route):
+        self.routes[path] = route
+        return route
+
+    def take(self, path):
+        """Return (route, status) for a request and count it."""
+        with self.lock:
+            self.requests += 1
+            route = self.routes.get(path)
+            if route is None:
+                status = 404
+            else:
+                route.hits += 1
+                status = route.fail_status if route.hits <= route.fail_times else 200
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            return route, status
+
+    def sent(self, n):
+        with self.lock:
+            self.bytes_sent += n
+
+
+def make_handler(scenario):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            route, status = scenario.take(urlsplit(self.path).path)
+            if route is not None and route.latency:
+                time.sleep(route.latency)
+
+            if status != 200:
+                self.send_response(status)
+                if route is not None and route.retry_after is not None:
+                    self.send_header('Retry-After', str(route.retry_after))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            body = route.body
+            self.send_response(200)
+            self.send_header('Content-Type', route.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                for i in range(0, len(body), BODY_CHUNK):
+                    chunk = body[i:i + BODY_CHUNK]
+                    self.wfile.write(chunk)
+                    scenario.sent(len(chunk))
+                    if route.bytes_per_second:
+                        time.sleep(len(chunk) / route.bytes_per_second)
+            except (BrokenPipeError, ConnectionResetError):
+                # Clients abort non-PDF bodies early
+                self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return MockHandler
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping idle keep-alive connections is expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_servers(scenario, port=8200, hosts=4):
+    """Serve the scenario on `hosts` consecutive ports; returns the base URLs."""
+    handler = make_handler(scenario)
+    bases = []
+    for p in range(port, port + hosts):
+        server = MockServer(('127.0.0.1', p), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        bases.append(f"http://127.0.0.1:{p}")
+    return bases
+
+
+def add_publisher_page(scenario, base, path, fixture, pdf_body):
+    """
+    Serve a saved publisher page at `path` and a PDF wherever its link points.
+
+    Absolute links to the real publisher are rewritten to the mock host.
+    """
+    html = fixture.read_text(encoding='utf-8')
+    pdf_url = find_pdf_url([html], base + path)
+    if pdf_url is None:
+        scenario.add(path, Route(html.encode(), 'text/html; charset=utf-8'))
+        return None
+    parts = urlsplit(pdf_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    if origin != base:
+        html = html.replace(origin, base)
+    scenario.add(path, Route(html.encode(), 'text/html; charset=utf-8', latency=0.1))
+    scenario.add(parts.path, Route(pdf_body))
+    return parts.path
+
+
+def build_catalog(scenario, bases, n_publications=40):
+    """
+    Register a mixed workload and return catalog rows for it.
+
+    Of every ten publications five are plain PDFs, one has a slow body, one
+    is rate limited once with Retry-After, one answers 503 once, one serves
+    HTML in place of the PDF and one is a publisher page to resolve.
+    """
+    fixtures = sorted(FIXTURES.glob('*.html'))
+    rows = []
+    for i in range(n_publications):
+        base = bases[i % len(bases)]
+        # Distinct author/year/keywords so every entry gets its own filename
+        title = (f"{SURNAMES[i % len(SURNAMES)]}, A. ({2018 + i % 7}). "
+                 f"{TOPICS[i % len(TOPICS)]} And {TOPICS[(i // len(TOPICS)) % len(TOPICS)]} "
+                 f"In Mock Study {i}")
+        pdf = make_pdf_bytes(100_000 + (i * 7919) % 300_000, str(i))
+        kind = i % 10
+        pub_url = f"{base}/doi.org/10.0000/mock.{i}"
+        pdf_path = f"/files/paper{i}.pdf"
+
+        if kind == 5:
+            scenario.add(pdf_path, Route(pdf, bytes_per_second=256 * 1024))
+        elif kind == 6:
+            scenario.add(pdf_path, Route(pdf, fail_times=1, retry_after=1))
+        elif kind == 7:
+            scenario.add(pdf_path, Route(pdf, fail_status=503, fail_times=1))
+        elif kind == 8:
+            paywall = b'<!DOCTYPE html><html><body>Sign in to download</body></html>' * 2000
+            scenario.add(pdf_path, Route(paywall, 'application/pdf'))
+        elif kind == 9 and fixtures:
+            # Publication page on an "open access" host that must be scraped
+            pub_url = f"{base}/publications.jrc.ec.europa.eu/page/{i}"
+            fixture = fixtures[(i // 10) % len(fixtures)]
+            add_publisher_page(scenario, base, urlsplit(pub_url).path, fixture, pdf)
+            pdf_path = None
+        else:
+            scenario.add(pdf_path, Route(pdf, latency=0.05 + (i % 4) * 0.05))
+
+        rows.append({
+            'title': title,
+            'publication_url': pub_url,
+            'pdf_link': base + pdf_path if pdf_path else 'N/A'
+        })
+
+    # Listing page for obtain_publications.py
+    items = ''.join(
+        f'<li><a href="{row["publication_url"]}">{row["title"]}</a></li>' for row in rows
+    )
+    listing = f'<html><body><main><ul>{items}</ul></main></body></html>'
+    scenario.add(LISTING_PATH, Route(listing.encode(), 'text/html; charset=utf-8'))
+    return rows
+
+
+def write_catalog(rows, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['title', 'publication_url', 'pdf_link'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the publication sites")
+    parser.add_argument('--port', type=int, default=8200)
+    parser.add_argument('--hosts', type=int, default=4, help="number of ports (mock hosts)")
+    parser.add_argument('--publications', type=int, default=40)
+    parser.add_argument('--catalog', default="mock_publications.csv",
+                        help="where to write the matching catalog CSV")
+    args = parser.parse_args()
+
+    scenario = MockScenario()
+    bases = start_servers(scenario, args.port, args.hosts)
+    rows = build_catalog(scenario, bases, args.publications)
+    write_catalog(rows, args.catalog)
+    print(f"Serving {len(scenario.routes)} routes on {', '.join(bases)}")
+    print(f"Listing: {bases[0]}{LISTING_PATH}")
+    print(f"Catalog written to {args.catalog}; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n{scenario.requests} requests, {scenario.bytes_sent:,} bytes sent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Co-authorship Network Analysis
+Builds a sparse author collaboration graph from the author lists embedded in
+the publication catalog titles (stakeholder mapping for the landscape report)
+"""
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+# Configuration
+CSV_FILE = "ai_watch_publications.csv"
+OUTPUT_FOLDER = "landscape_analysis_output"
+
+# "Surname, I.," / "Compound Surname, I.J." / "Sotelo M. A." / "and Gomez, E."
+# An initial is a capital followed by a period, or a bare capital before a
+# comma/space, so the first letter of a title glued to "D.Can we..." is not
+# mistaken for an initial.
+INITIAL = r"(?:[A-Z]\.|[A-Z](?=[\s,]))"
+AUTHOR_PATTERN = re.compile(
+    r"\s*(?:and\s+)?"
+    r"(?P<surname>[^\W\d_][\w'’\-]*(?:\s+[^\W\d_][\w'’\-]*){0,2}?)"
+    r",?\s+"
+    r"(?P<initials>" + INITIAL + r"(?:\s?-?" + INITIAL + r")*)"
+    r"\s*,?"
+)
+ET_AL_PATTERN = re.compile(r"\s*,?\s*et\s+al\.?\s*,?", re.IGNORECASE)
+# Short citation form without initials: "Martínez-Plumed et al.,Title"
+LEAD_ET_AL_PATTERN = re.compile(
+    r"\s*(?P<surname>[^\W\d_][\w'’\-]*(?:\s+[^\W\d_][\w'’\-]*){0,2}?)"
+    r"\s+et\s+al\.?\s*,?",
+    re.IGNORECASE
+)
+
+
+def normalize_author(surname, initials=''):
+    """
+    Canonical key for an author: accent-free surname plus first initial.
+
+    Without initials the key is the bare surname; `CoauthorNetwork` resolves
+    those to a full key when the surname is unambiguous.
+    """
+    surname = unicodedata.normalize('NFKD', surname)
+    surname = ''.join(c for c in surname if not unicodedata.combining(c))
+    surname = re.sub(r"[\-\s]+", ' ', surname).strip().lower()
+    if not initials.strip():
+        return surname
+    return f"{surname}, {initials.strip()[0].lower()}"
+
+
+def parse_authors(title_text):
+    """
+    Split a catalog entry into (authors, title).
+
+    Authors are returned as (key, display_name) tuples in citation order.
+    Trailing "et al." is dropped since the remaining co-authors are unknown.
+    """
+    authors = []
+    pos = 0
+
+    lead = LEAD_ET_AL_PATTERN.match(title_text)
+    if lead:
+        surname = lead.group('surname').strip()
+        return [(normalize_author(surname), surname)], title_text[lead.end():].strip()
+
+    while True:
+        match = AUTHOR_PATTERN.match(title_text, pos)
+        if not match:
+            break
+        surname = match.group('surname').strip()
+        initials = match.group('initials').strip()
+        display_name = f"{surname}, {initials}"
+        authors.append((normalize_author(surname, initials), display_name))
+        pos = match.end()
+
+        et_al = ET_AL_PATTERN.match(title_text, pos)
+        if et_al:
+            pos = et_al.end()
+            break
+
+    return authors, title_text[pos:].strip()
+
+
+class CoauthorNetwork:
+    """Sparse co-authorship graph with interned integer author IDs."""
+
+    def __init__(self):
+        self.author_ids = {}
+        self.author_names = []
+        self.paper_authors = []
+        self.incidence = None
+        self.adjacency = None
+
+    def intern(self, key, display_name):
+        """Return the integer ID for an author, assigning one if new."""
+        author_id = self.author_ids.get(key)
+        if author_id is None:
+            author_id = len(self.author_names)
+            self.author_ids[key] = author_id
+            self.author_names.append(display_name)
+        return author_id
+
+    def add_publications(self, publications):
+        """Parse each publication's author list once into interned IDs."""
+        seen_urls = set()
+        parsed = []
+        for pub in publications:
+            url = pub.get('publication_url', '')
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            authors, _ = parse_authors(pub['title'])
+            if authors:
+                parsed.append(authors)
+        self.add_author_lists(parsed)
+
+    def add_catalog(self, catalog):
+        """Add publications from a publication_catalog frame (authors already parsed)."""
+        catalog = catalog.drop_duplicates(subset='publication_url')
+        self.add_author_lists(
+            list(zip(keys, names))
+            for keys, names in zip(catalog['author_keys'], catalog['authors'])
+            if len(keys)
+        )
+
+    def add_author_lists(self, parsed):
+        """Intern one list of (key, display_name) authors per publication."""
+        parsed = list(parsed)
+        # "Charisi et al." -> "charisi, v" when only one Charisi has initials
+        full_keys = {}
+        for authors in parsed:
+            for key, _ in authors:
+                if ', ' in key:
+                    full_keys.setdefault(key.split(', ')[0], set()).add(key)
+
+        for authors in parsed:
+            ids = set()
+            for key, name in authors:
+                if ', ' not in key and len(full_keys.get(key, ())) == 1:
+                    key = next(iter(full_keys[key]))
+                ids.add(self.intern(key, name))
+            self.paper_authors.append(sorted(ids))
+
+    def build(self):
+        """Build the paper-author incidence and author-author adjacency matrices."""
+        rows = np.repeat(
+            np.arange(len(self.paper_authors)),
+            [len(ids) for ids in self.paper_authors]
+        )
+        cols = np.fromiter(
+            (author_id for ids in self.paper_authors for author_id in ids),
+            dtype=np.int64,
+            count=len(rows)
+        )
+        self.incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self.paper_authors), len(self.author_names))
+        )
+
+        # Edge weight = number of co-authored publications
+        adjacency = (self.incidence.T @ self.incidence).tocsr()
+        adjacency.setdiag(0)
+        adjacency.eliminate_zeros()
+        self.adjacency = adjacency
+        return self.adjacency
+
+    def eigenvector_centrality(self, max_iter=200, tol=1e-8):
+        """Eigenvector centrality by sparse power iteration."""
+        n = self.adjacency.shape[0]
+        if n == 0:
+            return np.zeros(0)
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            # Adding x (A + I) avoids oscillation on bipartite components
+            x_next = self.adjacency @ x + x
+            norm = np.linalg.norm(x_next)
+            if norm == 0:
+                return x_next
+            x_next /= norm
+            if np.abs(x_next - x).sum() < n * tol:
+                return x_next
+            x = x_next
+        return x
+
+    def compute_metrics(self):
+        """Degree, centrality and connected components for every author."""
+        n = self.adjacency.shape[0]
+        degree = np.diff(self.adjacency.indptr)
+        weighted_degree = np.asarray(self.adjacency.sum(axis=1)).ravel()
+        papers = np.asarray(self.incidence.sum(axis=0)).ravel()
+        n_components, labels = connected_components(self.adjacency, directed=False)
+
+        # Number components by size so component 0 is the largest
+        sizes = np.bincount(labels)
+        order = np.argsort(-sizes, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+
+        nodes = pd.DataFrame({
+            'author': self.author_names,
+            'papers': papers,
+            'degree': degree,
+            'weighted_degree': weighted_degree,
+            'degree_centrality': degree / max(n - 1, 1),
+            'eigenvector_centrality': self.eigenvector_centrality(),
+            'component': rank[labels]
+        })
+        return nodes.sort_values(
+            ['eigenvector_centrality', 'degree'], ascending=False
+        ).reset_index(drop=True), n_components, sizes[order]
+
+    def edges(self):
+        """Undirected edge list (each pair once) with collaboration counts."""
+        upper = sparse.triu(self.adjacency, k=1).tocoo()
+        names = np.array(self.author_names, dtype=object)
+        return pd.DataFrame({
+            'source': names[upper.row],
+            'target': names[upper.col],
+            'weight': upper.data
+        }).sort_values('weight', ascending=False).reset_index(drop=True)
+
+    def run(self, output_folder=OUTPUT_FOLDER, top_n=15, approximate=None):
+        """
+        Compute metrics and export nodes, edges and a summary for the report.
+
+        `approximate` (preview settings) is stored in the summary so outputs
+        from a preview run are marked as such.
+        """
+        print("\nBuilding co-authorship network...")
+        data_folder = Path(output_folder) / "data"
+        data_folder.mkdir(parents=True, exist_ok=True)
+
+        self.build()
+        nodes, n_components, component_sizes = self.compute_metrics()
+        edges = self.edges()
+
+        nodes.to_csv(data_folder / "coauthor_nodes.csv", index=False)
+        edges.to_csv(data_folder / "coauthor_edges.csv", index=False)
+
+        summary = {
+            'publications': len(self.paper_authors),
+            'authors': len(self.author_names),
+            'collaborations': len(edges),
+            'components': int(n_components),
+            'largest_component_size': int(component_sizes[0]) if len(component_sizes) else 0,
+            'top_authors': [
+                {
+                    'author': row.author,
+                    'papers': int(row.papers),
+                    'coauthors': int(row.degree),
+                    'eigenvector_centrality': round(float(row.eigenvector_centrality), 4)
+                }
+                for row in nodes.head(top_n).itertuples()
+            ],
+            'top_collaborations': [
+                {'authors': [row.source, row.target], 'publications': int(row.weight)}
+                for row in edges.head(top_n).itertuples()
+            ]
+        }
+        if approximate:
+            summary['approximate'] = approximate
+        with open(data_folder / "coauthor_network.json", 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        print(f"  {summary['authors']} authors, {summary['collaborations']} collaborations, "
+              f"{summary['components']} connected components")
+        return summary
+
+
+def main():
+    """Build the network from the publication catalog."""
+    if not Path(CSV_FILE).exists():
+        print(f"[ERROR] {CSV_FILE} not found!")
+        return
+
+    from publication_catalog import load_catalog
+
+    network = CoauthorNetwork()
+    network.add_catalog(load_catalog(CSV_FILE, columns=['publication_url', 'author_keys', 'authors']))
+    summary = network.run(OUTPUT_FOLDER)
+
+    print("\nMost central authors:")
+    for author in summary['top_authors'][:10]:
+        print(f"  - {author['author']} ({author['papers']} papers, {author['coauthors']} co-authors)")
+
+
+if __name__ == "__main__":
+    main()
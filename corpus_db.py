@@ -0,0 +1,275 @@
+"""
+Searchable Corpus Database
+SQLite store for extracted texts, publication metadata and topic assignments,
+with an FTS5 full-text index for ranked snippet search
+
+Usage:
+    python corpus_db.py build                 # import saved analysis outputs
+    python corpus_db.py search "human oversight" [-n 10]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from publication_catalog import load_catalog
+
+# Configuration
+CSV_FILE = "ai_watch_publications.csv"
+OUTPUT_FOLDER = "landscape_analysis_output"
+DB_FILE = "landscape_analysis_output/data/corpus.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    filename TEXT UNIQUE NOT NULL,
+    pdf_size INTEGER,
+    pdf_mtime REAL,
+    text_sha1 TEXT NOT NULL,
+    word_count INTEGER,
+    char_count INTEGER,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS publications (
+    filename TEXT PRIMARY KEY,
+    title TEXT,
+    publication_url TEXT,
+    pdf_link TEXT,
+    year INTEGER
+);
+CREATE TABLE IF NOT EXISTS topics (
+    filename TEXT PRIMARY KEY,
+    topic INTEGER
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def text_sha1(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def to_match_query(query):
+    """Quote each term so user input like "AI-Act" is not parsed as FTS syntax."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+class CorpusDatabase:
+    """SQLite corpus with an FTS5 index, updated incrementally."""
+
+    def __init__(self, db_path=DB_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def get_cached_text(self, pdf_path):
+        """
+        Return the stored text for a PDF if the file is unchanged since it was
+        indexed (same size and mtime), otherwise None.
+        """
+        stat = pdf_path.stat()
+        row = self.conn.execute(
+            "SELECT d.pdf_size, d.pdf_mtime, f.text FROM documents d "
+            "JOIN documents_fts f ON f.rowid = d.id WHERE d.filename = ?",
+            (pdf_path.name,)
+        ).fetchone()
+        if row and row['pdf_size'] == stat.st_size and row['pdf_mtime'] == stat.st_mtime:
+            return row['text']
+        return None
+
+    def upsert_document(self, filename, text, pdf_path=None):
+        """
+        Insert or update one document; the FTS row is only rewritten when the
+        text actually changed. Returns True if anything was written.
+        """
+        sha1 = text_sha1(text)
+        pdf_size = pdf_mtime = None
+        if pdf_path is not None:
+            stat = Path(pdf_path).stat()
+            pdf_size, pdf_mtime = stat.st_size, stat.st_mtime
+
+        row = self.conn.execute(
+            "SELECT id, text_sha1, pdf_size, pdf_mtime FROM documents WHERE filename = ?",
+            (filename,)
+        ).fetchone()
+
+        if row is None:
+            cursor = self.conn.execute(
+                "INSERT INTO documents (filename, pdf_size, pdf_mtime, text_sha1, "
+                "word_count, char_count, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (filename, pdf_size, pdf_mtime, sha1, len(text.split()), len(text), time.time())
+            )
+            self.conn.execute(
+                "INSERT INTO documents_fts (rowid, text) VALUES (?, ?)",
+                (cursor.lastrowid, text)
+            )
+            return True
+
+        if row['text_sha1'] == sha1:
+            # Same text; only refresh the file stamp so the next run can skip extraction
+            if pdf_size is not None and (row['pdf_size'], row['pdf_mtime']) != (pdf_size, pdf_mtime):
+                self.conn.execute(
+                    "UPDATE documents SET pdf_size = ?, pdf_mtime = ? WHERE id = ?",
+                    (pdf_size, pdf_mtime, row['id'])
+                )
+            return False
+
+        self.conn.execute(
+            "UPDATE documents SET pdf_size = ?, pdf_mtime = ?, text_sha1 = ?, "
+            "word_count = ?, char_count = ?, updated_at = ? WHERE id = ?",
+            (pdf_size, pdf_mtime, sha1, len(text.split()), len(text), time.time(), row['id'])
+        )
+        self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row['id'],))
+        self.conn.execute(
+            "INSERT INTO documents_fts (rowid, text) VALUES (?, ?)", (row['id'], text)
+        )
+        return True
+
+    def prune_documents(self, keep_filenames):
+        """Drop documents whose PDFs are no longer in the corpus."""
+        keep = set(keep_filenames)
+        stale = [
+            (row['id'], row['filename'])
+            for row in self.conn.execute("SELECT id, filename FROM documents")
+            if row['filename'] not in keep
+        ]
+        for doc_id, filename in stale:
+            self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+            self.conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+            self.conn.execute("DELETE FROM topics WHERE filename = ?", (filename,))
+        return len(stale)
+
+    def sync_publications(self, csv_file=CSV_FILE):
+        """Load catalog metadata, keyed by the downloader's generated filename."""
+        catalog = load_catalog(csv_file, columns=['filename', 'title', 'publication_url',
+                                                  'pdf_link', 'year'])
+        catalog = catalog.astype(object).where(catalog.notna(), None)
+        rows = {}
+        for row in catalog.itertuples(index=False):
+            # First catalog entry wins when two entries map to the same file
+            rows.setdefault(row.filename, (
+                row.filename, row.title, row.publication_url, row.pdf_link,
+                int(row.year) if row.year is not None else None
+            ))
+        # Reload in one transaction so edited or removed entries never linger
+        self.conn.execute("DELETE FROM publications")
+        self.conn.executemany(
+            "INSERT INTO publications VALUES (?, ?, ?, ?, ?)", rows.values()
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def set_topics(self, assignments):
+        """Replace topic assignments from (filename, topic) pairs."""
+        self.conn.execute("DELETE FROM topics")
+        self.conn.executemany(
+            "INSERT INTO topics (filename, topic) VALUES (?, ?)",
+            [(filename, int(topic)) for filename, topic in assignments]
+        )
+        self.conn.commit()
+
+    def commit(self):
+        self.conn.commit()
+
+    def search(self, query, limit=10, raw=False):
+        """
+        Ranked full-text search (BM25) returning snippets and metadata.
+
+        With raw=True the query is passed to FTS5 unchanged, allowing
+        operators such as NEAR, OR and prefix* queries.
+        """
+        match = query if raw else to_match_query(query)
+        rows = self.conn.execute(
+            """
+            SELECT d.filename, p.title, p.year, t.topic,
+                   snippet(documents_fts, 0, '[', ']', '...', 16) AS snippet,
+                   bm25(documents_fts) AS score
+            FROM documents_fts
+            JOIN documents d ON d.id = documents_fts.rowid
+            LEFT JOIN publications p ON p.filename = d.filename
+            LEFT JOIN topics t ON t.filename = d.filename
+            WHERE documents_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def import_outputs(self, output_folder=OUTPUT_FOLDER, csv_file=CSV_FILE):
+        """Incrementally import extracted_texts.json and topic_assignments.csv."""
+        data_folder = Path(output_folder) / "data"
+        texts_path = data_folder / "extracted_texts.json"
+        assignments_path = data_folder / "topic_assignments.csv"
+
+        updated = 0
+        if texts_path.exists():
+            with open(texts_path, 'r', encoding='utf-8') as f:
+                documents = json.load(f)
+            for doc in documents:
+                updated += self.upsert_document(doc['filename'], doc['text'])
+            self.prune_documents(doc['filename'] for doc in documents)
+            self.commit()
+
+        if Path(csv_file).exists():
+            self.sync_publications(csv_file)
+
+        if assignments_path.exists():
+            with open(assignments_path, 'r', encoding='utf-8') as f:
+                self.set_topics((row['filename'], row['topic']) for row in csv.DictReader(f))
+
+        return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over the analysed corpus")
+    parser.add_argument('--db', default=DB_FILE, help="SQLite database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('build', help="import saved analysis outputs into the database")
+
+    search = commands.add_parser('search', help="ranked full-text search")
+    search.add_argument('query')
+    search.add_argument('-n', '--limit', type=int, default=10)
+    search.add_argument('--raw', action='store_true', help="pass the query to FTS5 unchanged")
+
+    args = parser.parse_args()
+    db = CorpusDatabase(args.db)
+
+    if args.command == 'build':
+        updated = db.import_outputs(OUTPUT_FOLDER, CSV_FILE)
+        total = db.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        print(f"Indexed {total} documents ({updated} new or changed) in {args.db}")
+    else:
+        start = time.perf_counter()
+        results = db.search(args.query, limit=args.limit, raw=args.raw)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for i, result in enumerate(results, 1):
+            label = result['title'] or result['filename']
+            meta = [str(result['year'])] if result['year'] else []
+            if result['topic'] is not None:
+                meta.append(f"topic {result['topic']}")
+            print(f"{i}. {label[:100]}" + (f" ({', '.join(meta)})" if meta else ""))
+            print(f"   {result['snippet']}\n")
+        print(f"{len(results)} results in {elapsed_ms:.1f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Compact document storage for the landscape analysis
+Keeps one copy of each large text body, optionally spilled to disk and loaded
+on demand, behind small __slots__ records
+"""
+
+import json
+from pathlib import Path
+
+
+class TextStore:
+    """
+    Holds text bodies by key, either in memory or in an append-only file.
+
+    In spill mode only (offset, length) pairs stay in memory; `get` reads
+    the body back from disk when it is needed.
+    """
+
+    def __init__(self, spill_path=None):
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._texts = {}
+        self._offsets = {}
+        self._file = None
+        if self.spill_path:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.spill_path, 'w+b')
+
+    def put(self, key, text):
+        """Store a text body (replacing any previous value for the key)."""
+        if self._file is None:
+            self._texts[key] = text
+            return
+        data = text.encode('utf-8')
+        self._file.seek(0, 2)
+        self._offsets[key] = (self._file.tell(), len(data))
+        self._file.write(data)
+
+    def get(self, key):
+        """Return the text body for a key, loading it from disk if spilled."""
+        if self._file is None:
+            return self._texts.get(key, "")
+        if key not in self._offsets:
+            return ""
+        offset, length = self._offsets[key]
+        self._file.seek(offset)
+        return self._file.read(length).decode('utf-8')
+
+    def __contains__(self, key):
+        return key in (self._offsets if self._file else self._texts)
+
+    def close(self):
+        """Close and delete the spill file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.spill_path.unlink(missing_ok=True)
+
+
+class DocumentRecord:
+    """One document; text bodies live in the shared TextStores, not here."""
+
+    __slots__ = (
+        'filename', 'word_count', 'char_count',
+        'processed_word_count', 'topic', '_texts', '_processed'
+    )
+
+    def __init__(self, filename, text, texts, processed_store):
+        self.filename = filename
+        self.word_count = len(text.split())
+        self.char_count = len(text)
+        self.processed_word_count = 0
+        self.topic = -1
+        self._texts = texts
+        self._processed = processed_store
+        texts.put(filename, text)
+
+    @property
+    def text(self):
+        return self._texts.get(self.filename)
+
+    @property
+    def processed_text(self):
+        return self._processed.get(self.filename)
+
+    @processed_text.setter
+    def processed_text(self, value):
+        self._processed.put(self.filename, value)
+        self.processed_word_count = len(value.split())
+
+    def to_dict(self):
+        """Plain dict in the extracted_texts.json layout."""
+        return {
+            'filename': self.filename,
+            'text': self.text,
+            'word_count': self.word_count,
+            'char_count': self.char_count
+        }
+
+
+class DocumentTable:
+    """Ordered collection of DocumentRecords sharing two TextStores."""
+
+    def __init__(self, spill_folder=None):
+        spill_folder = Path(spill_folder) if spill_folder else None
+        self.texts = TextStore(spill_folder / "texts.bin" if spill_folder else None)
+        self.processed = TextStore(spill_folder / "processed.bin" if spill_folder else None)
+        self.records = []
+
+    def add(self, filename, text):
+        record = DocumentRecord(filename, text, self.texts, self.processed)
+        self.records.append(record)
+        return record
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def dump_json(self, path):
+        """Write extracted_texts.json one record at a time."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("[")
+            for i, record in enumerate(self.records):
+                if i:
+                    f.write(",")
+                entry = json.dumps(record.to_dict(), indent=2, ensure_ascii=False)
+                f.write("\n  " + entry.replace("\n", "\n  "))
+            f.write("\n]" if self.records else "]")
+
+    def close(self):
+        self.texts.close()
+        self.processed.close()
@@ -0,0 +1,114 @@
+"""
+Download manifest for the PDF downloaders
+Records, per downloaded file, the source URL, HTTP validators (ETag,
+Last-Modified), size and SHA-256 so later runs can resume interrupted
+transfers, revalidate PDFs with conditional requests and recognise the same
+PDF downloaded under two names
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFEST_NAME = "download_manifest.json"
+
+
+def now_iso():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class DownloadManifest:
+    """
+    JSON manifest keyed by output filename, safe to share between threads.
+
+    Entries are either 'partial' (a transfer started; validators are kept so
+    the .part file can be resumed with a Range request) or 'complete'. A
+    complete entry with 'alias_of' is a duplicate of another file's content.
+    The manifest lives in the PDF folder, next to the files it describes.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        # SHA-256 -> filenames of complete, non-alias entries
+        self.by_hash = {}
+        for filename, entry in self.entries.items():
+            self._index(filename, entry)
+
+    def _index(self, filename, entry):
+        if entry.get('status') == 'complete' and not entry.get('alias_of'):
+            self.by_hash.setdefault(entry['sha256'], set()).add(filename)
+
+    def _unindex(self, filename):
+        entry = self.entries.get(filename)
+        if entry and entry.get('sha256') in self.by_hash:
+            self.by_hash[entry['sha256']].discard(filename)
+
+    def get(self, filename):
+        with self._lock:
+            entry = self.entries.get(filename)
+            return dict(entry) if entry else None
+
+    def start(self, filename, url, etag=None, last_modified=None):
+        """Record that a transfer began, with the validators the server sent."""
+        with self._lock:
+            self._unindex(filename)
+            self.entries[filename] = {
+                'url': url,
+                'status': 'partial',
+                'etag': etag,
+                'last_modified': last_modified,
+                'started_at': now_iso()
+            }
+            self._save()
+
+    def complete(self, filename, url, size, sha256, etag=None, last_modified=None):
+        with self._lock:
+            self._unindex(filename)
+            self.entries[filename] = {
+                'url': url,
+                'status': 'complete',
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': size,
+                'sha256': sha256,
+                'downloaded_at': now_iso(),
+                'checked_at': now_iso()
+            }
+            self._index(filename, self.entries[filename])
+            self._save()
+
+    def find_duplicate(self, filename, sha256):
+        """Another complete file on disk with the same content, or None."""
+        with self._lock:
+            for other in sorted(self.by_hash.get(sha256, ())):
+                if other != filename and (self.path.parent / other).exists():
+                    return other
+        return None
+
+    def mark_alias(self, filename, canonical):
+        """Record that `filename` holds the same content as `canonical`."""
+        with self._lock:
+            self._unindex(filename)
+            self.entries[filename]['alias_of'] = canonical
+            self._save()
+
+    def mark_checked(self, filename):
+        """Note a successful revalidation (304 Not Modified)."""
+        with self._lock:
+            if filename in self.entries:
+                self.entries[filename]['checked_at'] = now_iso()
+                self._save()
+
+    def _save(self):
+        # Write-then-rename so a crash never leaves a half-written manifest
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
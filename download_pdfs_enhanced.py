@@ -1,128 +1,307 @@
+import argparse
 import csv
+import hashlib
+import json
 import os
 import time
 import re
+import threading
 import requests
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
 from pathlib import Path
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml is much faster for the anchor fallback; html.parser works everywhere
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+from download_manifest import MANIFEST_NAME, DownloadManifest
+from http_client import HttpClient
+from publication_names import generate_filename
+from rate_limiter import RETRY_STATUSES, RETRYABLE_ERRORS, RateLimiter
+from resolver_cache import CACHE_NAME, ResolverCache
 
 # Configuration
 CSV_FILE = "ai_watch_publications.csv"
 PDF_FOLDER = "humaint_pdfs"
-MAX_FILENAME_LENGTH = 80
+MAX_WORKERS = 8            # Publications processed in parallel
+PER_HOST_CONCURRENCY = 2   # Simultaneous requests to the same host
+PER_HOST_DELAY = 1.5       # Seconds between request starts on the same host (before adapting)
+MAX_PDF_BYTES = 200 * 1024 * 1024  # Abort downloads larger than this
+CHUNK_SIZE = 64 * 1024
+PDF_MAGIC = b'%PDF-'
+PDF_HEADER_WINDOW = 1024   # Readers accept the header anywhere in the first KiB
+QUARANTINE_FOLDER = "quarantine"  # Subfolder of PDF_FOLDER for files that are not valid PDFs
+HTML_CHUNK_SIZE = 16 * 1024   # Publication pages are read incrementally in chunks of this size
+RESOLVER_VERSION = 1       # Bump when extract_pdf_link rules change to invalidate cached resolutions
+
+RATE_LIMITER = RateLimiter(rate=1 / PER_HOST_DELAY, max_concurrent=PER_HOST_CONCURRENCY)
+HTTP = HttpClient(pool_maxsize=PER_HOST_CONCURRENCY)
+
+class DownloadTooLarge(Exception):
+    """Raised when a response body exceeds MAX_PDF_BYTES."""
 
-def sanitize_filename(filename):
-    """Remove or replace characters that are invalid in filenames."""
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    filename = re.sub(r'[_\s]+', '_', filename)
-    filename = filename.strip('_. ')
-    return filename
+class NotAPdf(Exception):
+    """Raised when a response body does not start with the %PDF- header."""
 
-def extract_first_author(title_text):
-    """Extract the first author's last name from the publication text."""
-    match = re.match(r'^([A-Za-zÀ-ÿ\-]+),?\s+[A-Z]\.?', title_text)
-    if match:
-        return match.group(1)
+class ResolveError(Exception):
+    """Raised when a publication page could not be fetched (as opposed to having no PDF)."""
+
+def stream_to_file(response, output_path, max_bytes=MAX_PDF_BYTES, progress=None,
+                   resume_from=0, keep_partial=False):
+    """
+    Stream a response body to `output_path` without buffering it in memory.
     
-    match = re.match(r'^([A-Za-zÀ-ÿ\-]+)\s+et\s+al', title_text, re.IGNORECASE)
-    if match:
-        return match.group(1)
+    Data goes to a sibling `.part` file which is fsynced and renamed into
+    place only once the body is complete, so an interrupted transfer never
+    leaves a truncated file under the final name. With `resume_from` > 0 the
+    body is the remainder of a range request and is appended to the existing
+    `.part` file; with `keep_partial` a `.part` file cut short by a network
+    error is left in place for a later resume. `progress`, if given, is
+    called as progress(bytes_written, total_bytes_or_None) after each chunk.
     
-    return None
+    The first PDF_HEADER_WINDOW bytes must contain the %PDF- header, so a
+    paywall or login page is rejected with NotAPdf after its first chunk
+    instead of being saved in full.
+    Returns (size, sha256_hexdigest) of the completed file.
+    """
+    length = int(response.headers.get('content-length') or 0) or None
+    total = resume_from + length if length else None
+    if total and total > max_bytes:
+        raise DownloadTooLarge(f"{total} bytes exceeds limit of {max_bytes}")
+    
+    part_path = output_path.with_name(output_path.name + '.part')
+    sha256 = hashlib.sha256()
+    written = 0
+    head = b''
+    if resume_from:
+        # The hash covers the whole file, so fold in the bytes already on disk
+        with open(part_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                sha256.update(chunk)
+                written += len(chunk)
+                if len(head) < PDF_HEADER_WINDOW:
+                    head += chunk[:PDF_HEADER_WINDOW - len(head)]
+    
+    try:
+        with open(part_path, 'ab' if resume_from else 'wb') as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if not chunk:
+                    continue
+                if len(head) < PDF_HEADER_WINDOW:
+                    head += chunk[:PDF_HEADER_WINDOW - len(head)]
+                    if len(head) >= PDF_HEADER_WINDOW and PDF_MAGIC not in head:
+                        raise NotAPdf(f"body starts with {head[:24]!r}")
+                written += len(chunk)
+                if written > max_bytes:
+                    raise DownloadTooLarge(f"body exceeds limit of {max_bytes} bytes")
+                f.write(chunk)
+                sha256.update(chunk)
+                if progress:
+                    progress(written, total)
+            if PDF_MAGIC not in head:
+                raise NotAPdf(f"body starts with {head[:24]!r}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(part_path, output_path)
+    except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
+        if not keep_partial:
+            part_path.unlink(missing_ok=True)
+        raise
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    
+    # Persist the rename itself (POSIX only)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(output_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
+    return written, sha256.hexdigest()
 
-def extract_year(title_text):
-    """Extract year from the title text."""
-    years = re.findall(r'\b(20[12]\d)\b', title_text)
-    if years:
-        return years[0]
+def check_pdf_file(path):
+    """
+    Cheap structural check of a PDF on disk.
+    
+    Returns None if it looks complete, 'not_pdf' if the %PDF- header is
+    missing (typically a saved HTML page) or 'truncated' if there is no
+    %%EOF marker near the end.
+    """
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        if PDF_MAGIC not in f.read(PDF_HEADER_WINDOW):
+            return 'not_pdf'
+        f.seek(max(size - PDF_HEADER_WINDOW, 0))
+        if b'%%EOF' not in f.read():
+            return 'truncated'
     return None
 
-def extract_title_keywords(title_text):
-    """Extract key words from the title (after author info)."""
-    parts = re.split(r'[,\.](?=[A-Z])', title_text)
-    
-    for part in parts:
-        if len(part) > 20 and not re.match(r'^[A-Z]\.\s*$', part.strip()):
-            title_part = part.strip()
-            words = re.findall(r'\b[A-Z][a-z]+\b', title_part)
-            if len(words) >= 2:
-                return '_'.join(words[:4])
-    
-    words = title_text.split()[:5]
-    return '_'.join(w for w in words if len(w) > 3)[:40]
+class Quarantine:
+    """
+    Keeps invalid files out of the PDF folder.
+    
+    Files that are not PDFs are moved into the quarantine folder (so they are
+    downloaded again and never reach text extraction); possibly truncated
+    files are only flagged. Both are logged to quarantine.json there.
+    """
+    
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.log_path = self.folder / "quarantine.json"
+        self._lock = threading.Lock()
+        self.moved = []
+        self.flagged = []
+    
+    def move(self, path, reason):
+        with self._lock:
+            self.folder.mkdir(exist_ok=True)
+            os.replace(path, self.folder / path.name)
+            self.moved.append(path.name)
+            self._record(path.name, 'quarantined', reason)
+    
+    def flag(self, path, reason):
+        with self._lock:
+            self.flagged.append(path.name)
+            self._record(path.name, 'flagged', reason)
+    
+    def _record(self, filename, action, reason):
+        self.folder.mkdir(exist_ok=True)
+        entries = {}
+        if self.log_path.exists():
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        entries[filename] = {
+            'action': action,
+            'reason': reason,
+            'at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        }
+        with open(self.log_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False, sort_keys=True)
 
-def generate_filename(title_text, url, index):
-    """Generate an informative filename from publication metadata."""
-    author = extract_first_author(title_text)
-    year = extract_year(title_text)
-    keywords = extract_title_keywords(title_text)
-    
-    parts = []
-    if author:
-        parts.append(author)
-    if year:
-        parts.append(year)
-    if keywords:
-        parts.append(keywords)
-    
-    if not parts:
-        parts.append(f"publication_{index:03d}")
-    
-    filename = '_'.join(parts)
-    filename = sanitize_filename(filename)
-    
-    if len(filename) > MAX_FILENAME_LENGTH:
-        filename = filename[:MAX_FILENAME_LENGTH]
-    
-    return filename + '.pdf'
+PDF_BUTTON_PATTERNS = [
+    'download pdf', 'pdf download', 'download article',
+    'full text pdf', 'view pdf', 'get pdf', 'pdf full-text'
+]
 
-def extract_pdf_from_page(url, max_retries=2):
+class HeadMetaParser(HTMLParser):
+    """
+    Incremental parser for the top of a page: records citation_pdf_url and
+    marks itself done at the end of <head> (or the start of <body>).
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pdf_url = None
+        self.done = False
+    
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'meta':
+            attrs = dict(attrs)
+            if 'citation_pdf_url' in (attrs.get('name'), attrs.get('property')) and attrs.get('content'):
+                self.pdf_url = attrs['content']
+                self.done = True
+        elif tag == 'body':
+            self.done = True
+    
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+
+def find_pdf_url_in_html(html, base_url):
+    """
+    Find a PDF link in a full page, parsing only <meta> and <a> elements.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer(['meta', 'a']))
+    
+    # Strategy 1: Meta tag citation_pdf_url (most reliable)
+    for meta in soup.find_all('meta'):
+        if meta.get('name') == 'citation_pdf_url' or meta.get('property') == 'citation_pdf_url':
+            pdf_url = meta.get('content')
+            if pdf_url:
+                return requests.compat.urljoin(base_url, pdf_url)
+    
+    anchors = soup.find_all('a', href=True)
+    
+    # Strategy 2: Direct PDF links
+    for a in anchors:
+        href = a.get('href')
+        if href.lower().endswith('.pdf'):
+            return requests.compat.urljoin(base_url, href)
+    
+    # Strategy 3: Common PDF download button text
+    for a in anchors:
+        text = a.get_text(strip=True).lower()
+        if any(pattern in text for pattern in PDF_BUTTON_PATTERNS):
+            href = a.get('href')
+            if href and 'pdf' in href.lower():
+                return requests.compat.urljoin(base_url, href)
+    
+    return None
+
+def find_pdf_url(chunks, base_url):
+    """
+    Find a PDF link in a page delivered as an iterable of text chunks.
+    
+    The <head> is scanned as the chunks arrive and reading stops as soon as
+    citation_pdf_url is found, so most publisher pages are never read or
+    parsed past their head. Otherwise the rest of the page is read and
+    handed to find_pdf_url_in_html.
+    """
+    parser = HeadMetaParser()
+    seen = []
+    for chunk in chunks:
+        seen.append(chunk)
+        if parser.done:
+            continue
+        parser.feed(chunk)
+        if parser.pdf_url:
+            return requests.compat.urljoin(base_url, parser.pdf_url)
+    return find_pdf_url_in_html(''.join(seen), base_url)
+
+def extract_pdf_from_page(url, max_retries=2, raise_on_error=False):
     """
     Tenta extrair link do PDF visitando a página da publicação (para open access).
+    
+    With raise_on_error, throttling, server and connection errors that outlast
+    the retries raise ResolveError instead of returning None, so callers can
+    tell "no PDF on the page" from "page unavailable".
     """
     for attempt in range(max_retries):
         try:
-            time.sleep(1.5)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Strategy 1: Meta tag citation_pdf_url (most reliable)
-            for meta in soup.find_all('meta'):
-                if meta.get('name') == 'citation_pdf_url' or meta.get('property') == 'citation_pdf_url':
-                    pdf_url = meta.get('content')
-                    if pdf_url:
-                        return requests.compat.urljoin(url, pdf_url)
-            
-            # Strategy 2: Direct PDF links
-            for a in soup.find_all('a', href=True):
-                href = a.get('href')
-                if href.lower().endswith('.pdf'):
-                    return requests.compat.urljoin(url, href)
-            
-            # Strategy 3: Common PDF download button text
-            pdf_patterns = [
-                'download pdf', 'pdf download', 'download article',
-                'full text pdf', 'view pdf', 'get pdf', 'pdf full-text'
-            ]
-            for a in soup.find_all('a', href=True):
-                text = a.get_text(strip=True).lower()
-                if any(pattern in text for pattern in pdf_patterns):
-                    href = a.get('href')
-                    if href and 'pdf' in href.lower():
-                        return requests.compat.urljoin(url, href)
-            
-            return None
+            with RATE_LIMITER.slot(url):
+                with HTTP.get(url, timeout=15, stream=True) as response:
+                    response.raise_for_status()
+                    RATE_LIMITER.record_success(url)
+                    if response.encoding is None:
+                        response.encoding = 'utf-8'
+                    return find_pdf_url(
+                        response.iter_content(HTML_CHUNK_SIZE, decode_unicode=True), url
+                    )
             
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429 and attempt < max_retries - 1:
-                time.sleep(3)
+            if e.response.status_code not in RETRY_STATUSES:
+                return None
+            if attempt < max_retries - 1:
+                time.sleep(RATE_LIMITER.backoff(url, attempt, e.response))
+            elif raise_on_error:
+                raise ResolveError(f"{url}: HTTP {e.response.status_code}") from e
+            else:
+                return None
+        except RETRYABLE_ERRORS as e:
+            if attempt < max_retries - 1:
+                time.sleep(RATE_LIMITER.backoff(url, attempt))
+            elif raise_on_error:
+                raise ResolveError(f"{url}: {e}") from e
             else:
                 return None
         except Exception:
@@ -130,7 +309,7 @@ def extract_pdf_from_page(url, max_retries=2):
     
     return None
 
-def extract_pdf_link(publication_url, try_page_scraping=True):
+def extract_pdf_link(publication_url, try_page_scraping=True, raise_on_error=False):
     """
     Tenta extrair link direto do PDF a partir da URL da publicação.
     """
@@ -179,7 +358,9 @@ def extract_pdf_link(publication_url, try_page_scraping=True):
         try:
             # Try to extract PDF from page
             if try_page_scraping:
-                return extract_pdf_from_page(publication_url)
+                return extract_pdf_from_page(publication_url, raise_on_error=raise_on_error)
+        except ResolveError:
+            raise
         except:
             pass
     
@@ -191,51 +372,140 @@ def extract_pdf_link(publication_url, try_page_scraping=True):
             'publications.jrc.ec.europa.eu', 'iospress.nl'
         ]
         if any(domain in publication_url for domain in open_access_domains):
-            return extract_pdf_from_page(publication_url)
+            return extract_pdf_from_page(publication_url, raise_on_error=raise_on_error)
     
     return None
 
-def download_pdf(url, output_path, max_retries=3):
-    """Download a PDF with retry logic."""
+def manifest_headers(url, output_path, manifest):
+    """
+    Build request headers from the manifest entry for `output_path`.
+    
+    A complete file from the same URL gets If-None-Match / If-Modified-Since;
+    a `.part` file from an interrupted transfer gets Range / If-Range, so the
+    server sends the rest only if the resource is unchanged.
+    Returns (headers, resume_from, entry).
+    """
+    entry = manifest.get(output_path.name) if manifest else None
+    if not entry or entry['url'] != url:
+        return {}, 0, None
+    
+    if entry['status'] == 'complete':
+        if not output_path.exists() or output_path.stat().st_size != entry.get('size'):
+            return {}, 0, entry
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers, 0, entry
+    
+    part_path = output_path.with_name(output_path.name + '.part')
+    etag = entry.get('etag')
+    # If-Range needs a strong validator; weak ETags fall back to Last-Modified
+    validator = etag if etag and not etag.startswith('W/') else entry.get('last_modified')
+    if validator and part_path.exists() and part_path.stat().st_size > 0:
+        resume_from = part_path.stat().st_size
+        return {'Range': f'bytes={resume_from}-', 'If-Range': validator}, resume_from, entry
+    return {}, 0, entry
+
+def content_range_start(response):
+    """First byte position of a 206 response's Content-Range, or None."""
+    match = re.match(r'bytes (\d+)-', response.headers.get('content-range', ''))
+    return int(match.group(1)) if match else None
+
+def download_pdf(url, output_path, max_retries=3, log=print, progress=None, manifest=None):
+    """
+    Download a PDF with retry logic, streaming it atomically to disk.
+    
+    With a `manifest`, a file already downloaded from the same URL is
+    revalidated with a conditional GET, and a transfer interrupted by a
+    network error is resumed with a Range request instead of restarting.
+    Returns 'downloaded', 'not_modified', 'not_pdf' (the server sent
+    something else, e.g. a paywall page) or 'failed'.
+    """
+    output_path = Path(output_path)
+    part_path = output_path.with_name(output_path.name + '.part')
+    
     for attempt in range(max_retries):
+        headers, resume_from, entry = manifest_headers(url, output_path, manifest)
         try:
-            time.sleep(2)
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            with RATE_LIMITER.slot(url):
+                with HTTP.get(url, timeout=30, stream=True, headers=headers) as response:
+                    if response.status_code == 304 and entry:
+                        RATE_LIMITER.record_success(url)
+                        manifest.mark_checked(output_path.name)
+                        return 'not_modified'
+                    response.raise_for_status()
+                    
+                    if resume_from:
+                        if response.status_code != 206:
+                            # Resource changed (If-Range failed) or ranges unsupported
+                            log("      Cannot resume, restarting download")
+                            resume_from = 0
+                        elif content_range_start(response) != resume_from:
+                            log("      Unexpected Content-Range, restarting download")
+                            part_path.unlink(missing_ok=True)
+                            continue
+                        else:
+                            log(f"      Resuming at byte {resume_from}")
+                    
+                    # Check if response is actually a PDF
+                    content_type = response.headers.get('content-type', '').lower()
+                    if 'pdf' not in content_type and not url.endswith('.pdf'):
+                        log(f"      Warning: Content-Type is {content_type}, may not be a PDF")
+                    
+                    etag = response.headers.get('etag')
+                    last_modified = response.headers.get('last-modified')
+                    if resume_from:
+                        etag = etag or entry.get('etag')
+                        last_modified = last_modified or entry.get('last_modified')
+                    elif manifest:
+                        manifest.start(output_path.name, url, etag, last_modified)
+                    
+                    # Save the file
+                    size, sha256 = stream_to_file(
+                        response, output_path, progress=progress,
+                        resume_from=resume_from, keep_partial=manifest is not None
+                    )
             
-            # Check if response is actually a PDF
-            content_type = response.headers.get('content-type', '').lower()
-            if 'pdf' not in content_type and not url.endswith('.pdf'):
-                print(f"      Warning: Content-Type is {content_type}, may not be a PDF")
-            
-            # Save the file
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
-            
-            return True
+            RATE_LIMITER.record_success(url)
+            if manifest:
+                manifest.complete(output_path.name, url, size, sha256, etag, last_modified)
+            return 'downloaded'
             
+        except NotAPdf as e:
+            log(f"      Rejected, not a PDF: {e}")
+            return 'not_pdf'
+        except DownloadTooLarge as e:
+            log(f"      Failed: {e}")
+            return 'failed'
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** (attempt + 1)
-                    print(f"      Rate limited. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"      Failed: {e}")
-                    return False
+            status = e.response.status_code
+            if status == 416 and resume_from:
+                # Stale .part file larger than the resource; start over
+                part_path.unlink(missing_ok=True)
+            elif status in RETRY_STATUSES and attempt < max_retries - 1:
+                wait_time = RATE_LIMITER.backoff(url, attempt, e.response)
+                log(f"      HTTP {status}. Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
             else:
-                print(f"      Failed: {e}")
-                return False
+                log(f"      Failed: {e}")
+                return 'failed'
+        except RETRYABLE_ERRORS as e:
+            if attempt < max_retries - 1:
+                if manifest is not None and part_path.exists():
+                    log(f"      Transfer interrupted, will resume: {e}")
+                wait_time = RATE_LIMITER.backoff(url, attempt)
+                log(f"      {type(e).__name__}. Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
+            else:
+                log(f"      Failed: {e}")
+                return 'failed'
         except Exception as e:
-            print(f"      Failed: {e}")
-            return False
+            log(f"      Failed: {e}")
+            return 'failed'
     
-    return False
+    return 'failed'
 
 def safe_print(text):
     """Print text with fallback for Unicode errors."""
@@ -244,9 +514,180 @@ def safe_print(text):
     except UnicodeEncodeError:
         print(text.encode('ascii', 'replace').decode('ascii'))
 
+def resolve_pdf_link(publication_url, resolver_cache=None, log=print):
+    """
+    Find a PDF URL for a publication page, consulting the resolver cache first.
+    
+    Definite results (including "no PDF") are cached; pages that could not be
+    fetched are not, so they are retried on the next run.
+    """
+    if resolver_cache is not None:
+        hit, pdf_url = resolver_cache.lookup(publication_url)
+        if hit:
+            log("      Using cached resolution")
+            return pdf_url
+    
+    try:
+        pdf_url = extract_pdf_link(publication_url, try_page_scraping=True, raise_on_error=True)
+    except ResolveError as e:
+        log(f"      Could not fetch publication page: {e}")
+        return None
+    
+    if resolver_cache is not None:
+        resolver_cache.store(publication_url, pdf_url)
+    return pdf_url
+
+def flag_if_truncated(output_path, quarantine, log):
+    """Flag a freshly downloaded file that has no %%EOF trailer."""
+    if quarantine is not None and check_pdf_file(output_path) == 'truncated':
+        quarantine.flag(output_path, "missing %%EOF trailer")
+        log("      Warning: no %%EOF trailer, file may be truncated")
+
+DEDUP_LOCK = threading.Lock()
+
+def dedupe_download(output_path, manifest, log):
+    """
+    Collapse a finished download whose content is already on disk.
+    
+    The duplicate becomes a hardlink to the existing file, or, where links
+    are unsupported, is deleted and kept only as an alias in the manifest.
+    Returns True if the file was a duplicate.
+    """
+    if manifest is None:
+        return False
+    with DEDUP_LOCK:
+        entry = manifest.get(output_path.name)
+        canonical = manifest.find_duplicate(output_path.name, entry['sha256'])
+        if canonical is None:
+            return False
+        link_path = output_path.with_name(output_path.name + '.link')
+        try:
+            os.link(output_path.with_name(canonical), link_path)
+            os.replace(link_path, output_path)
+            kept_as = "hardlink"
+        except OSError:
+            link_path.unlink(missing_ok=True)
+            output_path.unlink()
+            kept_as = "alias"
+        manifest.mark_alias(output_path.name, canonical)
+    log(f"      Same content as {canonical}, stored as {kept_as}")
+    return True
+
+def process_publication(pub, output_path, log, manifest=None, refresh=False,
+                        resolver_cache=None, quarantine=None):
+    """
+    Resolve and download one publication.
+    
+    Returns one of 'downloaded', 'updated', 'not_modified', 'exists',
+    'alias' (same content as another publication's file), 'no_link',
+    'not_pdf' or 'failed'.
+    """
+    entry = manifest.get(output_path.name) if manifest else None
+    if entry and entry.get('alias_of') and not output_path.exists():
+        if output_path.with_name(entry['alias_of']).exists():
+            log(f"      Alias of {entry['alias_of']}")
+            return 'alias'
+
+    # Existing files that are not PDFs are moved aside and downloaded again
+    if output_path.exists() and quarantine is not None:
+        problem = check_pdf_file(output_path)
+        if problem == 'not_pdf':
+            quarantine.move(output_path, "missing %PDF- header")
+            log(f"      Not a valid PDF, moved to quarantine: {output_path.name}")
+        elif problem == 'truncated':
+            quarantine.flag(output_path, "missing %%EOF trailer")
+            log("      Warning: no %%EOF trailer, file may be truncated")
+    
+    # Skip if already downloaded (the filename does not depend on the PDF URL)
+    if output_path.exists():
+        if not (refresh and entry):
+            if entry and entry.get('alias_of'):
+                log(f"      Already exists as a link to {entry['alias_of']}")
+                return 'alias'
+            log(f"      Already exists: {output_path.name}")
+            return 'exists'
+        
+        # Revalidate against the URL it was downloaded from; no scraping needed
+        log(f"      Revalidating: {output_path.name}")
+        status = download_pdf(entry['url'], output_path, log=log, manifest=manifest)
+        if status == 'not_modified':
+            log("      Not modified")
+            return 'not_modified'
+        if status == 'downloaded':
+            log("      Updated!")
+            if dedupe_download(output_path, manifest, log):
+                return 'alias'
+            flag_if_truncated(output_path, quarantine, log)
+            return 'updated'
+        return status
+    
+    pdf_url = pub['pdf_link']
+    
+    # If no direct PDF link in CSV, try to find one
+    resolved = not pdf_url or pdf_url == 'N/A'
+    if resolved:
+        log("      No direct PDF link, trying to extract...")
+        pdf_url = resolve_pdf_link(pub['publication_url'], resolver_cache, log)
+        
+        if pdf_url:
+            log(f"      Found PDF link!")
+        else:
+            log("      No PDF found - skipping")
+            return 'no_link'
+    
+    log(f"      Downloading to: {output_path.name}")
+    
+    # Download the PDF
+    status = download_pdf(pdf_url, output_path, log=log, manifest=manifest)
+    if status == 'downloaded':
+        log(f"      Success!")
+        if dedupe_download(output_path, manifest, log):
+            return 'alias'
+        flag_if_truncated(output_path, quarantine, log)
+        return 'downloaded'
+    if resolved and resolver_cache is not None:
+        # The resolved link may be stale or point at a landing page; resolve it again next run
+        resolver_cache.invalidate(pub['publication_url'])
+    return status
+
+def plan_jobs(publications, pdf_folder):
+    """
+    Assign output files up front so two entries mapping to the same file are
+    never downloaded concurrently.
+    
+    Returns (jobs, duplicates): jobs are (header, pub, output_path) tuples and
+    duplicates (header, filename) pairs for later entries that reuse a file.
+    """
+    jobs = []
+    duplicates = []
+    claimed = set()
+    for i, pub in enumerate(publications, 1):
+        filename = generate_filename(pub['title'], pub['pdf_link'], i)
+        header = f"[{i}/{len(publications)}] {pub['title'][:60]}..."
+        if filename in claimed:
+            duplicates.append((header, filename))
+            continue
+        claimed.add(filename)
+        jobs.append((header, pub, Path(pdf_folder) / filename))
+    return jobs, duplicates
+
 def main():
+    parser = argparse.ArgumentParser(description="Download HUMAINT publication PDFs")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help="publications processed in parallel (1 = sequential)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="revalidate existing PDFs with conditional requests")
+    parser.add_argument('--rescrape', action='store_true',
+                        help="ignore cached PDF link resolutions and scrape pages again")
+    args = parser.parse_args()
+    
     pdf_folder = Path(PDF_FOLDER)
     pdf_folder.mkdir(exist_ok=True)
+    manifest = DownloadManifest(pdf_folder / MANIFEST_NAME)
+    resolver_cache = ResolverCache(pdf_folder / CACHE_NAME, RESOLVER_VERSION)
+    if args.rescrape:
+        resolver_cache.clear()
+    quarantine = Quarantine(pdf_folder / QUARANTINE_FOLDER)
     
     safe_print(f"PDF folder: {pdf_folder.absolute()}\n")
     safe_print("Enhanced mode: Will try to extract PDFs from open access journals\n")
@@ -260,60 +701,57 @@ def main():
         publications = list(reader)
     
     safe_print(f"Found {len(publications)} publications\n")
+    safe_print(f"Workers: {args.workers} (max {PER_HOST_CONCURRENCY} per host, "
+               f"{PER_HOST_DELAY}s between requests to the same host)\n")
     
     # Track statistics
-    downloaded = 0
-    skipped_no_link = 0
-    skipped_exists = 0
-    failed = 0
+    counts = {'downloaded': 0, 'updated': 0, 'not_modified': 0, 'exists': 0,
+              'alias': 0, 'no_link': 0, 'not_pdf': 0, 'failed': 0}
     
-    for i, pub in enumerate(publications, 1):
-        title = pub['title']
-        pdf_url = pub['pdf_link']
-        publication_url = pub['publication_url']
-        
-        safe_print(f"[{i}/{len(publications)}] {title[:60]}...")
-        
-        # If no direct PDF link in CSV, try to find one
-        if not pdf_url or pdf_url == 'N/A':
-            safe_print("      No direct PDF link, trying to extract...")
-            pdf_url = extract_pdf_link(publication_url, try_page_scraping=True)
-            
-            if pdf_url:
-                safe_print(f"      Found PDF link!")
-            else:
-                safe_print("      No PDF found - skipping")
-                skipped_no_link += 1
-                continue
-        
-        # Generate filename
-        filename = generate_filename(title, pdf_url, i)
-        output_path = pdf_folder / filename
-        
-        # Skip if already downloaded
-        if output_path.exists():
-            safe_print(f"      Already exists: {filename}")
-            skipped_exists += 1
-            continue
-        
-        safe_print(f"      Downloading to: {filename}")
-        
-        # Download the PDF
-        if download_pdf(pdf_url, output_path):
-            safe_print(f"      Success!")
-            downloaded += 1
-        else:
-            failed += 1
+    jobs, duplicates = plan_jobs(publications, pdf_folder)
+    for header, filename in duplicates:
+        safe_print(header)
+        safe_print(f"      Already exists: {filename}")
+        counts['exists'] += 1
+    
+    def run_job(job):
+        header, pub, output_path = job
+        lines = [header]
+        status = process_publication(pub, output_path, lines.append, manifest,
+                                     args.refresh, resolver_cache, quarantine)
+        return status, lines
+    
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            status, lines = future.result()
+            counts[status] += 1
+            # Each publication's log is printed as one block
+            for line in lines:
+                safe_print(line)
+    elapsed = time.monotonic() - start
     
     # Summary
     safe_print("\n" + "="*70)
     safe_print("DOWNLOAD SUMMARY")
     safe_print("="*70)
     safe_print(f"Total publications:       {len(publications)}")
-    safe_print(f"Successfully downloaded:  {downloaded}")
-    safe_print(f"Already existed:          {skipped_exists}")
-    safe_print(f"No PDF link found:        {skipped_no_link}")
-    safe_print(f"Failed to download:       {failed}")
+    safe_print(f"Successfully downloaded:  {counts['downloaded']}")
+    if args.refresh:
+        safe_print(f"Updated upstream:         {counts['updated']}")
+        safe_print(f"Not modified (304):       {counts['not_modified']}")
+    safe_print(f"Already existed:          {counts['exists']}")
+    safe_print(f"Duplicates (aliased):     {counts['alias']}")
+    safe_print(f"No PDF link found:        {counts['no_link']}")
+    safe_print(f"Rejected (not a PDF):     {counts['not_pdf']}")
+    safe_print(f"Failed to download:       {counts['failed']}")
+    safe_print(f"Quarantined invalid:      {len(quarantine.moved)}")
+    safe_print(f"Flagged as truncated:     {len(quarantine.flagged)}")
+    safe_print(f"Elapsed time:             {elapsed:.0f}s")
+    safe_print(f"HTTP connections:         {HTTP.format_stats()}")
+    safe_print(f"Rate limiting:            {RATE_LIMITER.format_stats()}")
+    safe_print(f"Resolver cache:           {resolver_cache.format_stats()}")
     safe_print(f"\nPDFs saved to: {pdf_folder.absolute()}")
 
 if __name__ == "__main__":
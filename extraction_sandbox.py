@@ -0,0 +1,290 @@
+"""
+Watchdog-guarded PDF extraction
+Runs PDFTextExtractor in a separate worker process with a per-document time
+limit and an address-space cap, so one malformed or enormous PDF cannot hang
+or exhaust the analysis run. A worker that times out or dies is killed and
+replaced, and the document goes on a quarantine list that later runs skip
+until the file changes (or --retry is given)
+
+Usage:
+    python extraction_sandbox.py              # list quarantined PDFs
+    python extraction_sandbox.py --retry      # re-extract them under the watchdog
+    python extraction_sandbox.py --clear
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+
+# Unix only; elsewhere only the time limit applies
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Configuration
+PDF_FOLDER = "humaint_pdfs"
+EXTRACT_TIMEOUT = 120       # Seconds one document may take before its worker is killed
+EXTRACT_MEMORY_MB = 2048    # Address space a worker may add beyond what it inherits (None = unlimited)
+QUARANTINE_NAME = "extraction_quarantine.json"
+
+
+def limit_memory(memory_mb):
+    """Cap this process's address space at what it already maps plus memory_mb."""
+    if resource is None or not memory_mb:
+        return
+    # A forked worker inherits the parent's mappings (models, libraries), which
+    # can be gigabytes before the first document is opened
+    try:
+        with open('/proc/self/statm') as f:
+            mapped = int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError):
+        mapped = 0
+    limit = mapped + memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass  # Not enforceable here (e.g. a lower hard limit is already set)
+
+
+def extraction_worker(conn, extractor, memory_mb):
+    """
+    Worker process: extract the PDFs sent over `conn` until it receives None.
+    Replies with (status, text or reason, CPU seconds).
+    """
+    limit_memory(memory_mb)
+    while True:
+        path = conn.recv()
+        if path is None:
+            break
+        start = time.process_time()
+        try:
+            status, result = 'ok', extractor.extract_file(Path(path))
+        except MemoryError:
+            status, result = 'memory', f"exceeded {memory_mb} MB"
+        except Exception as e:
+            status, result = 'error', f"{type(e).__name__}: {e}"
+        conn.send((status, result, time.process_time() - start))
+
+
+class Quarantine:
+    """
+    JSON list of PDFs whose extraction timed out or crashed.
+
+    Entries remember the file's size and mtime, so a replaced PDF is tried
+    again automatically.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def contains(self, pdf_path):
+        entry = self.entries.get(pdf_path.name)
+        if entry is None:
+            return None
+        stat = pdf_path.stat()
+        if entry['size'] != stat.st_size or entry['mtime'] != int(stat.st_mtime):
+            return None
+        return entry
+
+    def add(self, pdf_path, reason):
+        stat = pdf_path.stat()
+        with self._lock:
+            previous = self.entries.get(pdf_path.name, {})
+            self.entries[pdf_path.name] = {
+                'reason': reason,
+                'size': stat.st_size,
+                'mtime': int(stat.st_mtime),
+                'failures': previous.get('failures', 0) + 1,
+                'quarantined_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+            }
+            self._save()
+
+    def remove(self, pdf_path):
+        with self._lock:
+            if self.entries.pop(pdf_path.name, None) is not None:
+                self._save()
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class ExtractionSandbox:
+    """
+    Extract PDFs one at a time in a reusable worker process.
+
+    extract() returns the cleaned text, or None when the document has no
+    text, failed, or is quarantined. `last_failure` holds the reason for the
+    most recent None that was not simply an empty document.
+
+    Several sandboxes can run side by side (one per thread) if they share a
+    Quarantine. The worker is forked by default; pass start_method='forkserver'
+    when other threads are running, since a timed-out worker is replaced
+    mid-run and a plain fork would copy their held locks.
+    """
+
+    def __init__(self, extractor, timeout=EXTRACT_TIMEOUT, memory_mb=EXTRACT_MEMORY_MB,
+                 quarantine=None, retry_quarantined=False, start_method=None):
+        self.extractor = extractor
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.quarantine = quarantine or Quarantine(extractor.pdf_folder / QUARANTINE_NAME)
+        self.retry_quarantined = retry_quarantined
+        methods = multiprocessing.get_all_start_methods()
+        if start_method not in methods:
+            start_method = 'fork' if 'fork' in methods else None
+        self.context = multiprocessing.get_context(start_method)
+        self.process = None
+        self.conn = None
+        self.restarts = 0
+        self.failed = 0
+        self.skipped = 0
+        self.cpu_seconds = 0.0
+        self.last_failure = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """Start the worker now instead of on the first extract()."""
+        if self.process is None:
+            self._start()
+
+    def _start(self):
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=extraction_worker,
+            args=(child_conn, self.extractor, self.memory_mb),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def _kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def is_quarantined(self, pdf_path):
+        """The quarantine entry for pdf_path, unless retrying or the file changed."""
+        if self.retry_quarantined:
+            return None
+        return self.quarantine.contains(pdf_path)
+
+    def extract(self, pdf_path, log=print):
+        entry = self.is_quarantined(pdf_path)
+        self.last_failure = entry and entry['reason']
+        if entry is not None:
+            self.skipped += 1
+            log(f"    Skipped: quarantined ({entry['reason']}) {pdf_path.name}")
+            return None
+
+        if self.process is None or not self.process.is_alive():
+            if self.process is not None:
+                self.restarts += 1
+                self._kill()
+            self._start()
+
+        try:
+            self.conn.send(str(pdf_path))
+            if self.conn.poll(self.timeout):
+                status, result, cpu_seconds = self.conn.recv()
+                self.cpu_seconds += cpu_seconds
+            else:
+                status, result = 'timeout', f"no result after {self.timeout}s"
+        except (EOFError, OSError):
+            # The worker died mid-document (segfault, abort on allocation failure...)
+            self.process.join()
+            status, result = 'crashed', f"worker exited with code {self.process.exitcode}"
+
+        if status == 'ok':
+            self.quarantine.remove(pdf_path)
+            return result
+
+        if status in ('timeout', 'crashed'):
+            self.restarts += 1
+            self._kill()
+        self.failed += 1
+        self.last_failure = f"{status}: {result}"
+        self.quarantine.add(pdf_path, self.last_failure)
+        log(f"    Quarantined: {status} ({result}) {pdf_path.name}")
+        return None
+
+    def format_stats(self):
+        return (f"{self.failed} failed, {self.skipped} skipped as quarantined, "
+                f"{self.restarts} worker restarts")
+
+    def close(self):
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=5)
+            except OSError:
+                pass
+        self._kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or retry quarantined PDF extractions")
+    parser.add_argument('--pdf-folder', default=PDF_FOLDER)
+    parser.add_argument('--retry', action='store_true', help="extract quarantined PDFs again")
+    parser.add_argument('--clear', action='store_true', help="empty the quarantine list")
+    args = parser.parse_args()
+
+    quarantine = Quarantine(Path(args.pdf_folder) / QUARANTINE_NAME)
+    if args.clear:
+        quarantine.clear()
+        print("Quarantine cleared")
+        return
+    if not quarantine.entries:
+        print("No quarantined PDFs")
+        return
+
+    for name, entry in sorted(quarantine.entries.items()):
+        print(f"  {name}: {entry['reason']} ({entry['failures']} failures, {entry['quarantined_at']})")
+    if not args.retry:
+        return
+
+    from landscape_analysis import PDFTextExtractor
+
+    print(f"\nRetrying {len(quarantine.entries)} PDFs (timeout {EXTRACT_TIMEOUT}s)...")
+    extractor = PDFTextExtractor(args.pdf_folder)
+    with ExtractionSandbox(extractor, quarantine=quarantine, retry_quarantined=True) as sandbox:
+        for name in sorted(quarantine.entries):
+            pdf_path = Path(args.pdf_folder) / name
+            if not pdf_path.exists():
+                quarantine.remove(pdf_path)
+                continue
+            print(f"  {name}")
+            text = sandbox.extract(pdf_path)
+            if text is not None:
+                print(f"    Extracted {len(text.split())} words")
+        print(f"\n{sandbox.format_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Shared HTTP client for the scraper and downloaders
+One pooled requests.Session per host, with common headers, timeouts and
+connect retries, plus connection-reuse statistics for run summaries
+(HTTP-level retries and backoff live in rate_limiter.py)
+"""
+
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Defaults
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+DEFAULT_HEADERS = {'User-Agent': USER_AGENT}
+DEFAULT_TIMEOUT = 30       # Seconds (connect and read)
+POOL_MAXSIZE = 4           # Keep-alive connections kept per host
+TRANSPORT_RETRIES = 2      # Retries for connections that could not be established
+
+
+def counting_pool_classes(on_connect):
+    """
+    urllib3 pool classes whose connections call on_connect() for every socket
+    they open. urllib3 reuses the connection object when a dropped keep-alive
+    connection reconnects, so pool counters alone undercount new connections.
+    """
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self):
+            on_connect()
+            super().connect()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            on_connect()
+            super().connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+
+class HttpClient:
+    """
+    Thread-safe factory of per-host sessions.
+
+    Every request to the same scheme://host:port goes through the same
+    session and connection pool, so TCP and TLS handshakes are paid once
+    per connection instead of once per request.
+    """
+
+    def __init__(self, pool_maxsize=POOL_MAXSIZE, timeout=DEFAULT_TIMEOUT,
+                 retries=TRANSPORT_RETRIES, headers=None):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._host_requests = Counter()
+        self._connections = 0
+        self._pool_classes = counting_pool_classes(self._count_connection)
+
+    def _count_connection(self):
+        with self._lock:
+            self._connections += 1
+
+    def _make_session(self):
+        session = requests.Session()
+        session.headers.update(self.headers)
+        # Only failed connection attempts are retried here; status codes, read
+        # errors and Retry-After go to the caller's RateLimiter so they can
+        # slow the whole host down
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=0,
+            status=0,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            backoff_factor=0.5,
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        # Default number of cached host pools: redirects to a CDN and back
+        # must not evict the session's own host
+        adapter = HTTPAdapter(
+            pool_maxsize=self.pool_maxsize,
+            pool_block=False,
+            max_retries=retry
+        )
+        adapter.poolmanager.pool_classes_by_scheme = self._pool_classes
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def session_for(self, url):
+        """Return the pooled session for the URL's host."""
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc.lower())
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._make_session()
+                self._sessions[key] = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session_for(url).request(method, url, **kwargs)
+        except requests.RequestException:
+            self._count_requests([url])
+            raise
+        # Each hop of a redirect chain is a request to the host that served it
+        self._count_requests([r.url for r in response.history] + [response.url])
+        return response
+
+    def _count_requests(self, urls):
+        with self._lock:
+            for url in urls:
+                self._host_requests[urlparse(url).netloc.lower()] += 1
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def stats(self):
+        """Requests issued, sockets opened and how many requests reused one."""
+        with self._lock:
+            requests_made = sum(self._host_requests.values())
+            hosts = len(self._host_requests)
+            connections = self._connections
+        return {
+            'hosts': hosts,
+            'requests': requests_made,
+            'connections': connections,
+            'reused': max(requests_made - connections, 0)
+        }
+
+    def format_stats(self):
+        """One summary line for the end-of-run report."""
+        stats = self.stats()
+        rate = stats['reused'] / stats['requests'] if stats['requests'] else 0
+        return (f"{stats['requests']} requests to {stats['hosts']} hosts over "
+                f"{stats['connections']} connections ({rate:.0%} reused)")
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
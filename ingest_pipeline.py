@@ -0,0 +1,236 @@
+"""
+Overlapped download and text extraction
+Runs the enhanced downloader and hands each PDF to PDFTextExtractor worker
+processes as soon as it is on disk, through a bounded queue, so network and
+CPU work overlap instead of running one after the other. Each worker runs in
+an ExtractionSandbox, so hanging or crashing PDFs are killed and quarantined
+as in the analysis
+
+Usage:
+    python ingest_pipeline.py [--workers 8] [--extract-workers 3]
+"""
+
+import argparse
+import csv
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import download_pdfs_enhanced as downloader
+from document_store import DocumentTable
+from download_manifest import MANIFEST_NAME, DownloadManifest
+from extraction_sandbox import QUARANTINE_NAME, ExtractionSandbox, Quarantine
+from landscape_analysis import CSV_FILE, OUTPUT_FOLDER, PDF_FOLDER, PDFTextExtractor
+from resolver_cache import CACHE_NAME, ResolverCache
+
+# Configuration
+QUEUE_SIZE = 8   # Finished downloads waiting for extraction before downloaders block
+EXTRACT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+READY_STATUSES = {'downloaded', 'updated', 'not_modified', 'exists'}
+
+
+def file_key(path):
+    """Identity of a file on disk, shared by all hardlinks to it."""
+    stat = path.stat()
+    return (stat.st_dev, stat.st_ino) if stat.st_ino else str(path)
+
+
+def make_sandboxes(extractor, workers):
+    """
+    Extraction sandboxes, their workers started before any download thread exists.
+
+    Workers come from a fork server where available: it imports the analysis
+    stack once, and workers replaced after a timeout mid-run are forked from
+    it rather than from this process, so they never inherit locks held by the
+    download threads.
+    """
+    start_method = None
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        start_method = 'forkserver'
+        multiprocessing.get_context('forkserver').set_forkserver_preload(
+            ['landscape_analysis', 'extraction_sandbox']
+        )
+    quarantine = Quarantine(extractor.pdf_folder / QUARANTINE_NAME)
+    sandboxes = [ExtractionSandbox(extractor, quarantine=quarantine, start_method=start_method)
+                 for _ in range(workers)]
+    for sandbox in sandboxes:
+        sandbox.start()
+    return sandboxes
+
+
+def run_ingest(pdf_folder=PDF_FOLDER, csv_file=CSV_FILE, documents=None, corpus_db=None,
+               download_workers=downloader.MAX_WORKERS, extract_workers=EXTRACT_WORKERS):
+    """
+    Download the catalog and extract every PDF into a DocumentTable.
+
+    The table holds the same documents, in the same order, as
+    PDFTextExtractor.extract_all on the finished folder; PDFs already in the
+    folder are extracted while the missing ones download.
+    """
+    pdf_folder = Path(pdf_folder)
+    pdf_folder.mkdir(exist_ok=True)
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        publications = list(csv.DictReader(f))
+
+    manifest = DownloadManifest(pdf_folder / MANIFEST_NAME)
+    resolver_cache = ResolverCache(pdf_folder / CACHE_NAME, downloader.RESOLVER_VERSION)
+    quarantine = downloader.Quarantine(pdf_folder / downloader.QUARANTINE_FOLDER)
+    extractor = PDFTextExtractor(pdf_folder)
+    jobs, duplicates = downloader.plan_jobs(publications, pdf_folder)
+
+    print(f"\nIngesting {len(publications)} publications "
+          f"({download_workers} download workers, {extract_workers} extraction workers)...")
+
+    sandboxes = make_sandboxes(extractor, extract_workers)
+    ready = queue.Queue(maxsize=QUEUE_SIZE)
+    print_lock = threading.Lock()
+    counts = Counter(exists=len(duplicates))
+    timings = {}
+    start = time.monotonic()
+
+    def download(job):
+        header, pub, output_path = job
+        lines = [header]
+        status = downloader.process_publication(
+            pub, output_path, lines.append, manifest, False, resolver_cache, quarantine
+        )
+        with print_lock:
+            for line in lines:
+                downloader.safe_print(line)
+        if status in READY_STATUSES and output_path.exists():
+            # Blocks while extraction is behind (backpressure on the downloads)
+            ready.put(output_path)
+            return status, output_path.name
+        return status, None
+
+    def produce():
+        queued = set()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, download_workers)) as executor:
+                for status, name in executor.map(download, jobs):
+                    counts[status] += 1
+                    if name:
+                        queued.add(file_key(pdf_folder / name))
+            timings['network'] = time.monotonic() - start
+            # PDFs in the folder that no catalog entry produced this run
+            for pdf_path in extractor.list_pdfs():
+                if file_key(pdf_path) not in queued:
+                    ready.put(pdf_path)
+        finally:
+            ready.put(None)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    texts = {}
+    fresh = set()
+    pending = queue.Queue(maxsize=extract_workers * 2)
+
+    def log(line):
+        with print_lock:
+            print(line)
+
+    def extract(sandbox):
+        # One thread per sandbox; each waits on its worker process with a time limit
+        while True:
+            pdf_path = pending.get()
+            if pdf_path is None:
+                break
+            text = sandbox.extract(pdf_path, log)
+            if text is not None:
+                with print_lock:
+                    texts[pdf_path.name] = text
+                    fresh.add(pdf_path.name)
+                    print(f"  [extracted] {pdf_path.name}")
+            elif sandbox.last_failure is None:
+                log(f"  [no text] {pdf_path.name}")
+
+    extract_threads = [threading.Thread(target=extract, args=(sandbox,), daemon=True)
+                       for sandbox in sandboxes]
+    for thread in extract_threads:
+        thread.start()
+
+    # The corpus database connection belongs to this thread, so cache lookups stay here
+    while True:
+        pdf_path = ready.get()
+        if pdf_path is None:
+            break
+        if corpus_db is not None:
+            cached_text = corpus_db.get_cached_text(pdf_path)
+            if cached_text is not None:
+                texts[pdf_path.name] = cached_text
+                continue
+        pending.put(pdf_path)
+
+    producer.join()
+    for _ in extract_threads:
+        pending.put(None)
+    for thread in extract_threads:
+        thread.join()
+    for sandbox in sandboxes:
+        sandbox.close()
+    cpu_seconds = sum(sandbox.cpu_seconds for sandbox in sandboxes)
+    elapsed = time.monotonic() - start
+
+    # Same documents and order as extract_all on the finished folder; texts
+    # are matched by file identity since a hardlinked duplicate may be listed
+    # under a different name than the one that was extracted
+    texts = {file_key(pdf_folder / name): text for name, text in texts.items()}
+    fresh = {file_key(pdf_folder / name) for name in fresh}
+    if documents is None:
+        documents = DocumentTable()
+    for pdf_path in extractor.list_pdfs():
+        key = file_key(pdf_path)
+        text = texts.get(key)
+        if text is None:
+            if not sandboxes[0].quarantine.contains(pdf_path):
+                print(f"    Warning: Could not extract meaningful text from {pdf_path.name}")
+            continue
+        documents.add(pdf_path.name, text)
+        if corpus_db is not None and key in fresh:
+            corpus_db.upsert_document(pdf_path.name, text, pdf_path)
+    if corpus_db is not None:
+        corpus_db.prune_documents(doc.filename for doc in documents)
+        corpus_db.commit()
+
+    print(f"\nDownloads: {counts['downloaded']} new, {counts['exists']} existing, "
+          f"{counts['alias']} duplicates aliased, {counts['no_link']} without link, "
+          f"{counts['not_pdf']} not PDFs, {counts['failed']} failed")
+    print(f"Extracted text from {len(documents)} documents "
+          f"({len(texts) - len(fresh)} from the corpus database)")
+    failed = sum(sandbox.failed for sandbox in sandboxes)
+    skipped = sum(sandbox.skipped for sandbox in sandboxes)
+    if failed or skipped:
+        print(f"Extraction: {failed} PDFs quarantined this run, {skipped} skipped as quarantined "
+              f"(see {sandboxes[0].quarantine.path})")
+    print(f"Network phase {timings.get('network', elapsed):.0f}s, extraction CPU "
+          f"{cpu_seconds:.0f}s over {extract_workers} workers, total {elapsed:.0f}s")
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download PDFs and extract their text in one pass")
+    parser.add_argument('--workers', type=int, default=downloader.MAX_WORKERS,
+                        help="publications downloaded in parallel")
+    parser.add_argument('--extract-workers', type=int, default=EXTRACT_WORKERS,
+                        help="PDF text extraction processes")
+    args = parser.parse_args()
+
+    if not Path(CSV_FILE).exists():
+        print(f"Error: {CSV_FILE} not found!")
+        return
+
+    documents = run_ingest(download_workers=args.workers, extract_workers=max(1, args.extract_workers))
+    data_folder = Path(OUTPUT_FOLDER) / "data"
+    data_folder.mkdir(parents=True, exist_ok=True)
+    documents.dump_json(data_folder / "extracted_texts.json")
+    print(f"\nTexts saved to {data_folder / 'extracted_texts.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,8 @@ for public policy students
 import os
 import re
 import json
+import random
 from pathlib import Path
-from datetime import datetime
 from collections import Counter, defaultdict
 import warnings
 warnings.filterwarnings('ignore')
@@ -41,10 +41,27 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 
+from temporal_analysis import TemporalTopicAnalyzer, load_publication_years
+from coauthor_network import CoauthorNetwork
+from document_store import DocumentTable
+from corpus_db import CorpusDatabase
+from publication_catalog import load_catalog
+from report_renderer import CHARTS, DATA_FILES, write_report
+
 # Configuration
 PDF_FOLDER = "humaint_pdfs"
 OUTPUT_FOLDER = "landscape_analysis_output"
 CSV_FILE = "ai_watch_publications.csv"
+SPILL_TEXTS = False  # Keep document text on disk instead of in memory (large corpora)
+HTML_REPORT = False  # Also write LANDSCAPE_ASSESSMENT_REPORT.html
+CORPUS_DB = None  # e.g. "landscape_analysis_output/data/corpus.db" for full-text search
+INGEST_DOWNLOADS = False  # Download missing PDFs first, extracting each as it arrives (ingest_pipeline.py)
+# Quick approximate run, e.g. {'pages': 3, 'random_pages': 2, 'fraction': 0.25, 'seed': 42}:
+# first `pages` pages plus `random_pages` sampled ones per PDF, on a `fraction` of the PDFs.
+# Results are marked approximate and written to OUTPUT_FOLDER + "_preview".
+PREVIEW = None
+SANDBOX_EXTRACTION = True  # Extract each PDF in a watchdog-guarded worker process (extraction_sandbox.py)
+CHART_DATA_VERSION = 1  # Schema of the visualizations/*.json chart datasets read by the slide app
 
 # Download NLTK data if needed
 try:
@@ -57,16 +74,34 @@ except LookupError:
 class PDFTextExtractor:
     """Extract and clean text from PDF files."""
     
-    def __init__(self, pdf_folder):
+    def __init__(self, pdf_folder, pages=None, random_pages=0, fraction=1.0, seed=42):
         self.pdf_folder = Path(pdf_folder)
-        
+        # Preview budgets; the defaults read every page of every PDF
+        self.pages = pages
+        self.random_pages = random_pages
+        self.fraction = fraction
+        self.seed = seed
+    
+    @property
+    def sampled(self):
+        return self.pages is not None or self.fraction < 1
+    
+    def select_pages(self, n_pages, pdf_path):
+        """Page numbers to read: the first `pages` plus a random sample of the rest."""
+        if self.pages is None:
+            return range(n_pages)
+        selected = list(range(min(self.pages, n_pages)))
+        rest = range(len(selected), n_pages)
+        # Seeded per file, so reruns read the same pages
+        rng = random.Random(f"{self.seed}:{pdf_path.name}")
+        selected += sorted(rng.sample(rest, min(self.random_pages, len(rest))))
+        return selected
+    
     def extract_text_pymupdf(self, pdf_path):
         """Extract text using PyMuPDF (better quality)."""
         try:
             doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
+            text = "".join(doc[i].get_text() for i in self.select_pages(len(doc), pdf_path))
             doc.close()
             return text
         except Exception as e:
@@ -78,9 +113,8 @@ class PDFTextExtractor:
         try:
             with open(pdf_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
+                pages = self.select_pages(len(reader.pages), pdf_path)
+                text = "".join(reader.pages[i].extract_text() for i in pages)
             return text
         except Exception as e:
             print(f"  PyPDF2 failed for {pdf_path.name}: {e}")
@@ -108,35 +142,85 @@ class PDFTextExtractor:
         
         return text.strip()
     
-    def extract_all(self):
-        """Extract text from all PDFs in folder."""
-        pdf_files = list(self.pdf_folder.glob("*.pdf"))
+    def list_pdfs(self):
+        """PDFs in the folder, skipping hardlinks to a file already listed."""
+        pdf_files = []
+        seen = set()
+        for pdf_path in self.pdf_folder.glob("*.pdf"):
+            stat = pdf_path.stat()
+            # st_ino is 0 on filesystems without inode numbers; never collapse those
+            key = (stat.st_dev, stat.st_ino)
+            if stat.st_ino and key in seen:
+                continue
+            seen.add(key)
+            pdf_files.append(pdf_path)
+        self.documents_available = len(pdf_files)
+        if self.fraction < 1 and pdf_files:
+            # Same documents on every run with the same seed, in folder order
+            rng = random.Random(self.seed)
+            keep = set(rng.sample(range(len(pdf_files)), max(1, round(len(pdf_files) * self.fraction))))
+            pdf_files = [path for i, path in enumerate(pdf_files) if i in keep]
+        return pdf_files
+    
+    def extract_file(self, pdf_path):
+        """Extract and clean one PDF; returns None if it has no meaningful text."""
+        # Try PyMuPDF first (better quality)
+        text = self.extract_text_pymupdf(pdf_path)
+        
+        # Fallback to PyPDF2
+        if not text or len(text.strip()) < 100:
+            text = self.extract_text_pypdf2(pdf_path)
+        
+        if text and len(text.strip()) > 100:
+            return self.clean_text(text)
+        return None
+    
+    def extract_all(self, documents=None, corpus_db=None, sandbox=None):
+        """
+        Extract text from all PDFs in folder into a DocumentTable.
         
+        With a CorpusDatabase, unchanged PDFs reuse their indexed text and
+        new or modified ones are added to the index. With an ExtractionSandbox,
+        each PDF is extracted in its worker process under a time limit and
+        quarantined PDFs are skipped.
+        """
+        pdf_files = self.list_pdfs()
+        
+        if self.sampled:
+            budget = "all pages" if self.pages is None else f"first {self.pages} + {self.random_pages} random pages"
+            print(f"\nPreview: {len(pdf_files)} sampled PDFs, {budget} each")
         print(f"\nExtracting text from {len(pdf_files)} PDFs...")
         
-        documents = []
+        if documents is None:
+            documents = DocumentTable()
         for i, pdf_path in enumerate(pdf_files, 1):
             print(f"  [{i}/{len(pdf_files)}] {pdf_path.name}")
             
-            # Try PyMuPDF first (better quality)
-            text = self.extract_text_pymupdf(pdf_path)
-            
-            # Fallback to PyPDF2
-            if not text or len(text.strip()) < 100:
-                text = self.extract_text_pypdf2(pdf_path)
+            if corpus_db is not None:
+                cached_text = corpus_db.get_cached_text(pdf_path)
+                if cached_text is not None:
+                    documents.add(pdf_path.name, cached_text)
+                    continue
             
-            if text and len(text.strip()) > 100:
-                cleaned_text = self.clean_text(text)
-                documents.append({
-                    'filename': pdf_path.name,
-                    'text': cleaned_text,
-                    'word_count': len(cleaned_text.split()),
-                    'char_count': len(cleaned_text)
-                })
+            if sandbox is not None:
+                cleaned_text = sandbox.extract(pdf_path)
             else:
+                cleaned_text = self.extract_file(pdf_path)
+            if cleaned_text is not None:
+                documents.add(pdf_path.name, cleaned_text)
+                if corpus_db is not None:
+                    corpus_db.upsert_document(pdf_path.name, cleaned_text, pdf_path)
+            elif sandbox is None or sandbox.last_failure is None:
                 print(f"    Warning: Could not extract meaningful text")
         
+        if corpus_db is not None:
+            corpus_db.prune_documents(doc.filename for doc in documents)
+            corpus_db.commit()
+        
         print(f"\nSuccessfully extracted text from {len(documents)} documents")
+        if sandbox is not None and (sandbox.failed or sandbox.skipped):
+            print(f"Extraction sandbox: {sandbox.format_stats()} "
+                  f"(see {sandbox.quarantine.path})")
         return documents
 
 
@@ -253,6 +337,7 @@ class TopicModeler:
         
         # Get top words per topic
         feature_names = vectorizer.get_feature_names_out()
+        self.feature_names = feature_names
         
         return topics, feature_names
     
@@ -273,33 +358,73 @@ class TopicModeler:
         """Get top words for a topic."""
         if self.use_bertopic and self.model:
             return self.model.get_topic(topic_id)[:top_n]
+        if self.model is not None and topic_id < len(self.model.components_):
+            weights = self.model.components_[topic_id]
+            weights = weights / weights.sum()
+            return [(self.feature_names[i], float(weights[i])) for i in weights.argsort()[::-1][:top_n]]
         return []
 
 
 class LandscapeAnalyzer:
     """Main class for landscape analysis."""
     
-    def __init__(self, pdf_folder, output_folder):
+    def __init__(self, pdf_folder, output_folder, spill_texts=False, corpus_db=None, preview=None,
+                 sandbox=False):
         self.pdf_folder = pdf_folder
         self.output_folder = Path(output_folder)
         self.output_folder.mkdir(exist_ok=True)
         
-        self.documents = []
-        self.processed_docs = []
+        # Preview settings (see PREVIEW); partial texts never go into the corpus database
+        self.preview = preview
+        if preview:
+            corpus_db = None
+        self.sandbox = sandbox
+        
+        # With spill_texts, text bodies go to disk and are read back on demand
+        spill_folder = self.output_folder / "cache" if spill_texts else None
+        self.documents = DocumentTable(spill_folder)
+        self.processed_docs = self.documents
+        
+        # Optional SQLite/FTS5 index, filled as texts are extracted
+        self.corpus_db = CorpusDatabase(corpus_db) if corpus_db else None
         self.topics = None
+        self.documents_available = None
+        self.temporal_results = None
+        self.network_summary = None
+        self.charts_written = set()
         
         # Create subdirectories
         (self.output_folder / "visualizations").mkdir(exist_ok=True)
         (self.output_folder / "data").mkdir(exist_ok=True)
     
-    def extract_texts(self):
-        """Extract text from PDFs."""
-        extractor = PDFTextExtractor(self.pdf_folder)
-        self.documents = extractor.extract_all()
+    def extract_texts(self, download=False):
+        """
+        Extract text from PDFs.
+        
+        With download=True the catalog is downloaded first through
+        ingest_pipeline, extracting PDFs while the rest are still in transit.
+        """
+        if download and self.preview:
+            print("\nPreview mode: skipping downloads, sampling the PDFs already on disk")
+            download = False
+        if download:
+            from ingest_pipeline import run_ingest
+            run_ingest(self.pdf_folder, CSV_FILE, self.documents, corpus_db=self.corpus_db)
+        else:
+            extractor = PDFTextExtractor(self.pdf_folder, **(self.preview or {}))
+            if self.sandbox:
+                from extraction_sandbox import ExtractionSandbox
+                with ExtractionSandbox(extractor) as sandbox:
+                    extractor.extract_all(self.documents, corpus_db=self.corpus_db, sandbox=sandbox)
+            else:
+                extractor.extract_all(self.documents, corpus_db=self.corpus_db)
+            self.documents_available = extractor.documents_available
+        
+        if self.corpus_db and Path(CSV_FILE).exists():
+            self.corpus_db.sync_publications(CSV_FILE)
         
         # Save extracted texts
-        with open(self.output_folder / "data" / "extracted_texts.json", 'w', encoding='utf-8') as f:
-            json.dump(self.documents, f, indent=2, ensure_ascii=False)
+        self.documents.dump_json(self.output_folder / "data" / "extracted_texts.json")
         
         return self.documents
     
@@ -308,15 +433,9 @@ class LandscapeAnalyzer:
         print("\nPreprocessing texts...")
         preprocessor = TextPreprocessor()
         
-        self.processed_docs = []
+        # Records keep a single reference to the text; no per-document copies
         for doc in self.documents:
-            processed = preprocessor.preprocess(doc['text'])
-            self.processed_docs.append({
-                'filename': doc['filename'],
-                'original_text': doc['text'],
-                'processed_text': processed,
-                'word_count': len(processed.split())
-            })
+            doc.processed_text = preprocessor.preprocess(doc.text)
         
         return self.processed_docs
     
@@ -325,7 +444,7 @@ class LandscapeAnalyzer:
         print(f"\nPerforming topic modeling with {n_topics} topics...")
         
         # Get processed texts
-        texts = [doc['processed_text'] for doc in self.processed_docs]
+        texts = [doc.processed_text for doc in self.processed_docs]
         
         # Fit topic model
         modeler = TopicModeler(n_topics=n_topics, use_bertopic=BERTOPIC_AVAILABLE)
@@ -338,33 +457,78 @@ class LandscapeAnalyzer:
         # Add topic assignments to documents
         for i, doc in enumerate(self.processed_docs):
             if isinstance(topics, np.ndarray):
-                doc['topic'] = int(np.argmax(topics[i]))
+                doc.topic = int(np.argmax(topics[i]))
             else:
-                doc['topic'] = int(topics[i])
+                doc.topic = int(topics[i])
+        
+        if self.corpus_db:
+            self.corpus_db.set_topics((doc.filename, doc.topic) for doc in self.processed_docs)
         
         return modeler
     
+    def perform_temporal_analysis(self, csv_file=CSV_FILE, n_topics=8):
+        """Track topic prevalence across publication years."""
+        if not Path(csv_file).exists():
+            print(f"\nSkipping temporal analysis: {csv_file} not found")
+            return None
+        
+        documents = pd.DataFrame([
+            {
+                'filename': doc.filename,
+                'topic': doc.topic,
+                'processed_text': doc.processed_text
+            }
+            for doc in self.processed_docs
+        ])
+        
+        analyzer = TemporalTopicAnalyzer(self.output_folder, n_topics=n_topics)
+        self.temporal_results = analyzer.run(documents, load_publication_years(csv_file),
+                                             approximate=self.approximate_info())
+        return self.temporal_results
+    
+    def perform_network_analysis(self, csv_file=CSV_FILE):
+        """Map co-authorship relations from the publication catalog."""
+        if not Path(csv_file).exists():
+            print(f"\nSkipping network analysis: {csv_file} not found")
+            return None
+        
+        network = CoauthorNetwork()
+        network.add_catalog(load_catalog(csv_file, columns=['publication_url', 'author_keys', 'authors']))
+        self.network_summary = network.run(self.output_folder, approximate=self.approximate_info())
+        return self.network_summary
+    
+    def approximate_info(self):
+        """Preview settings and sample size recorded in outputs, or None for a full run."""
+        if not self.preview:
+            return None
+        return dict(
+            self.preview,
+            documents_sampled=len(self.documents),
+            documents_available=self.documents_available
+        )
+    
     def generate_statistics(self):
         """Generate corpus statistics."""
         print("\nGenerating statistics...")
         
         stats = {
             'total_documents': len(self.documents),
-            'total_words': sum(doc['word_count'] for doc in self.documents),
-            'avg_words_per_doc': np.mean([doc['word_count'] for doc in self.documents]),
-            'median_words_per_doc': np.median([doc['word_count'] for doc in self.documents]),
-            'min_words': min(doc['word_count'] for doc in self.documents),
-            'max_words': max(doc['word_count'] for doc in self.documents)
+            'total_words': sum(doc.word_count for doc in self.documents),
+            'avg_words_per_doc': np.mean([doc.word_count for doc in self.documents]),
+            'median_words_per_doc': np.median([doc.word_count for doc in self.documents]),
+            'min_words': min(doc.word_count for doc in self.documents),
+            'max_words': max(doc.word_count for doc in self.documents)
         }
         
-        # Word frequency analysis
-        all_words = []
+        # Word frequency analysis (counted per document, no corpus-wide token list)
+        word_freq = Counter()
         for doc in self.processed_docs:
-            all_words.extend(doc['processed_text'].split())
-        
-        word_freq = Counter(all_words)
+            word_freq.update(doc.processed_text.split())
         stats['unique_words'] = len(word_freq)
         stats['top_20_words'] = word_freq.most_common(20)
+        if self.preview:
+            # Counts come from sampled pages of sampled documents
+            stats['approximate'] = self.approximate_info()
         
         # Save statistics
         with open(self.output_folder / "data" / "corpus_statistics.json", 'w') as f:
@@ -379,14 +543,20 @@ class LandscapeAnalyzer:
         viz_folder = self.output_folder / "visualizations"
         
         # 1. Word Cloud
-        all_text = ' '.join([doc['processed_text'] for doc in self.processed_docs])
+        all_text = ' '.join(doc.processed_text for doc in self.processed_docs)
         wordcloud = WordCloud(
             width=1200, 
             height=600, 
             background_color='white',
             colormap='viridis',
             max_words=100
-        ).generate(all_text)
+        )
+        # Same as generate(), keeping the counts for the chart data
+        term_counts = wordcloud.process_text(all_text)
+        wordcloud.generate_from_frequencies(term_counts)
+        self.write_chart_data(viz_folder, 'wordcloud', 'Most Frequent Terms in HUMAINT Literature', {
+            'terms': [[term, count] for term, count in Counter(term_counts).most_common(100)]
+        })
         
         plt.figure(figsize=(15, 8))
         plt.imshow(wordcloud, interpolation='bilinear')
@@ -394,10 +564,11 @@ class LandscapeAnalyzer:
         plt.title('Most Frequent Terms in HUMAINT Literature', fontsize=20, pad=20)
         plt.tight_layout()
         plt.savefig(viz_folder / "wordcloud.png", dpi=300, bbox_inches='tight')
+        self.charts_written.add("wordcloud.png")
         plt.close()
         
         # 2. Document length distribution
-        word_counts = [doc['word_count'] for doc in self.documents]
+        word_counts = [doc.word_count for doc in self.documents]
         
         plt.figure(figsize=(12, 6))
         plt.hist(word_counts, bins=20, color='steelblue', edgecolor='black', alpha=0.7)
@@ -409,7 +580,14 @@ class LandscapeAnalyzer:
         plt.grid(alpha=0.3)
         plt.tight_layout()
         plt.savefig(viz_folder / "document_lengths.png", dpi=300, bbox_inches='tight')
+        self.charts_written.add("document_lengths.png")
         plt.close()
+        counts, edges = np.histogram(word_counts, bins=20)
+        self.write_chart_data(viz_folder, 'document_lengths', 'Distribution of Document Lengths', {
+            'bin_edges': [round(float(edge), 2) for edge in edges],
+            'counts': counts.tolist(),
+            'mean': round(float(np.mean(word_counts)), 1)
+        })
         
         # 3. Top 20 words bar chart
         top_words, top_counts = zip(*stats['top_20_words'])
@@ -423,11 +601,15 @@ class LandscapeAnalyzer:
         plt.grid(axis='x', alpha=0.3)
         plt.tight_layout()
         plt.savefig(viz_folder / "top_words.png", dpi=300, bbox_inches='tight')
+        self.charts_written.add("top_words.png")
         plt.close()
+        self.write_chart_data(viz_folder, 'top_words', 'Top 20 Most Frequent Terms', {
+            'terms': [[word, count] for word, count in stats['top_20_words']]
+        })
         
         # 4. Topic distribution (if available)
         if hasattr(self, 'topics') and self.topics is not None:
-            topic_counts = Counter([doc['topic'] for doc in self.processed_docs])
+            topic_counts = Counter(doc.topic for doc in self.processed_docs)
             
             plt.figure(figsize=(12, 6))
             topics_list = sorted(topic_counts.keys())
@@ -441,137 +623,149 @@ class LandscapeAnalyzer:
             plt.grid(axis='y', alpha=0.3)
             plt.tight_layout()
             plt.savefig(viz_folder / "topic_distribution.png", dpi=300, bbox_inches='tight')
+            self.charts_written.add("topic_distribution.png")
             plt.close()
+            self.write_chart_data(viz_folder, 'topic_distribution', 'Documents per Topic', {
+                'topics': [
+                    {
+                        'id': int(topic),
+                        'documents': topic_counts[topic],
+                        'terms': [
+                            [word, round(float(score), 4)]
+                            for word, score in self.topic_model.get_topic_words(topic, top_n=10)
+                        ]
+                    }
+                    for topic in topics_list
+                ]
+            })
+        
+        print(f"  Visualizations saved to {viz_folder}/ (chart data as .json alongside)")
+    
+    def write_chart_data(self, viz_folder, chart, title, data):
+        """Write the numbers behind a chart as compact JSON for client-side rendering."""
+        payload = {'version': CHART_DATA_VERSION, 'chart': chart, 'title': title, **data}
+        if self.preview:
+            payload['approximate'] = True
+        with open(viz_folder / f"{chart}.json", 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    
+    def compute_policy_scores(self):
+        """Count policy-area term occurrences across the corpus."""
+        # Identify policy-relevant terms
+        policy_terms = {
+            'AI Governance & Regulation': ['regulation', 'policy', 'governance', 'act', 'law', 'compliance'],
+            'AI Ethics & Fairness': ['ethical', 'fairness', 'bias', 'discrimination', 'transparency'],
+            'AI & Society': ['social', 'society', 'human', 'impact', 'trust', 'rights'],
+            'AI Technology & Innovation': ['learning', 'model', 'algorithm', 'data', 'system', 'technology'],
+            'AI Applications': ['healthcare', 'autonomous', 'driving', 'education', 'recommendation']
+        }
         
-        print(f"  Visualizations saved to {viz_folder}/")
+        # Counted per document instead of over one joined, lower-cased corpus copy
+        area_counts = Counter()
+        for doc in self.processed_docs:
+            text_lower = doc.processed_text.lower()
+            for area, terms in policy_terms.items():
+                area_counts[area] += sum(text_lower.count(term) for term in terms)
+        
+        return {
+            area: {'terms': terms, 'score': area_counts[area]}
+            for area, terms in policy_terms.items()
+        }
     
-    def generate_report(self, stats):
-        """Generate final landscape assessment report."""
-        print("\nGenerating landscape assessment report...")
+    def get_topic_terms(self):
+        """Key terms per discovered topic, in the layout the report renderer reads."""
+        if not getattr(self, 'topic_model', None):
+            return None
         
-        report_path = self.output_folder / "LANDSCAPE_ASSESSMENT_REPORT.md"
+        if not (BERTOPIC_AVAILABLE and self.topic_model.use_bertopic):
+            return {'method': 'lda', 'topics': {}}
         
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write("# AI Research Landscape Assessment\n")
-            f.write("## HUMAINT Publications Analysis\n\n")
-            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("---\n\n")
-            
-            # Executive Summary
-            f.write("## Executive Summary\n\n")
-            f.write(f"This landscape assessment analyzes **{stats['total_documents']} research publications** ")
-            f.write(f"from the European Commission's HUMAINT initiative on AI and society.\n\n")
-            f.write(f"- **Total corpus size:** {stats['total_words']:,} words\n")
-            f.write(f"- **Unique terms:** {stats['unique_words']:,}\n")
-            f.write(f"- **Average document length:** {stats['avg_words_per_doc']:.0f} words\n")
-            f.write(f"- **Document range:** {stats['min_words']:,} to {stats['max_words']:,} words\n\n")
-            
-            # Key Themes
-            f.write("## Key Research Themes\n\n")
-            f.write("Based on frequency analysis, the most prominent themes include:\n\n")
-            
-            for i, (word, count) in enumerate(stats['top_20_words'][:10], 1):
-                f.write(f"{i}. **{word.title()}** ({count:,} occurrences)\n")
-            
-            f.write("\n")
-            
-            # Topic Analysis
-            if hasattr(self, 'topic_model') and self.topic_model:
-                f.write("## Discovered Research Topics\n\n")
-                
-                if BERTOPIC_AVAILABLE and self.topic_model.use_bertopic:
-                    topic_info = self.topic_model.get_topic_info()
-                    
-                    for idx in range(min(8, len(topic_info))):
-                        if idx == 0:  # Skip outlier topic
-                            continue
-                        
-                        topic_words = self.topic_model.get_topic_words(idx)
-                        if topic_words:
-                            f.write(f"### Topic {idx}\n\n")
-                            
-                            # Get documents in this topic
-                            topic_docs = [doc['filename'] for doc in self.processed_docs if doc.get('topic') == idx]
-                            
-                            f.write(f"**Key terms:** {', '.join([word for word, score in topic_words[:8]])}\n\n")
-                            f.write(f"**Documents in this topic:** {len(topic_docs)}\n\n")
-                            
-                            if topic_docs:
-                                f.write("**Example publications:**\n")
-                                for doc in topic_docs[:3]:
-                                    f.write(f"- {doc}\n")
-                            f.write("\n")
-                else:
-                    f.write("*Traditional LDA topic modeling was used. ")
-                    f.write("For better results, install BERTopic: `pip install bertopic sentence-transformers`*\n\n")
-            
-            # Research Areas for Public Policy
-            f.write("## Key Areas for Public Policy Students\n\n")
-            f.write("Based on this landscape analysis, the following research areas are prominent:\n\n")
-            
-            # Identify policy-relevant terms
-            policy_terms = {
-                'AI Governance & Regulation': ['regulation', 'policy', 'governance', 'act', 'law', 'compliance'],
-                'AI Ethics & Fairness': ['ethical', 'fairness', 'bias', 'discrimination', 'transparency'],
-                'AI & Society': ['social', 'society', 'human', 'impact', 'trust', 'rights'],
-                'AI Technology & Innovation': ['learning', 'model', 'algorithm', 'data', 'system', 'technology'],
-                'AI Applications': ['healthcare', 'autonomous', 'driving', 'education', 'recommendation']
-            }
-            
-            all_text_lower = ' '.join([doc['processed_text'] for doc in self.processed_docs]).lower()
-            
-            for area, terms in policy_terms.items():
-                count = sum(all_text_lower.count(term) for term in terms)
-                if count > 50:  # Only include if significant presence
-                    f.write(f"### {area}\n")
-                    f.write(f"*Relevance score: {count} term occurrences*\n\n")
-                    f.write(f"This area focuses on {', '.join(terms[:4])} and related concepts.\n\n")
-            
-            # Visualizations
-            f.write("## Visualizations\n\n")
-            f.write("The following visualizations are available in the `visualizations/` folder:\n\n")
-            f.write("1. **Word Cloud** - Visual representation of most frequent terms\n")
-            f.write("2. **Document Length Distribution** - Histogram of document sizes\n")
-            f.write("3. **Top Words Chart** - Bar chart of 20 most common terms\n")
-            f.write("4. **Topic Distribution** - Distribution of documents across topics\n\n")
-            
-            f.write("![Word Cloud](visualizations/wordcloud.png)\n\n")
-            
-            # Recommendations
-            f.write("## Recommendations for Further Research\n\n")
-            f.write("1. **Deep Dive into Specific Topics** - Use the topic assignments to cluster related research\n")
-            f.write("2. **Citation Network Analysis** - Map relationships between publications\n")
-            f.write("3. **Temporal Analysis** - Track evolution of themes over time\n")
-            f.write("4. **Policy Gap Analysis** - Identify under-researched policy areas\n")
-            f.write("5. **Stakeholder Mapping** - Analyze author networks and institutional affiliations\n\n")
-            
-            # Data Files
-            f.write("## Available Data Files\n\n")
-            f.write("- `data/extracted_texts.json` - Full text of all documents\n")
-            f.write("- `data/corpus_statistics.json` - Detailed statistics\n")
-            f.write("- `data/topic_assignments.csv` - Document-topic mappings (see below)\n\n")
-            
-            # Footer
-            f.write("---\n\n")
-            f.write("*This assessment was generated using state-of-the-art NLP techniques ")
-            f.write("including BERTopic and transformer-based models.*\n")
+        topic_info = self.topic_model.get_topic_info()
+        topics = {}
+        for idx in range(min(8, len(topic_info))):
+            if idx == 0:  # Skip outlier topic
+                continue
+            topic_words = self.topic_model.get_topic_words(idx)
+            if topic_words:
+                topics[str(idx)] = [word for word, score in topic_words[:8]]
+        return {'method': 'bertopic', 'topics': topics}
+    
+    def save_report_artifacts(self):
+        """Persist everything the report renderer needs besides the statistics."""
+        data_folder = self.output_folder / "data"
         
         # Save topic assignments as CSV
-        if self.processed_docs and 'topic' in self.processed_docs[0]:
+        if len(self.processed_docs) and self.topics is not None:
             df = pd.DataFrame([
                 {
-                    'filename': doc['filename'],
-                    'topic': doc.get('topic', -1),
-                    'word_count': doc['word_count']
+                    'filename': doc.filename,
+                    'topic': doc.topic,
+                    'word_count': doc.processed_word_count
                 }
                 for doc in self.processed_docs
             ])
-            df.to_csv(self.output_folder / "data" / "topic_assignments.csv", index=False)
+            df.to_csv(data_folder / "topic_assignments.csv", index=False)
+        
+        topic_terms = self.get_topic_terms()
+        if topic_terms is not None:
+            with open(data_folder / "topic_terms.json", 'w', encoding='utf-8') as f:
+                json.dump(topic_terms, f, indent=2, ensure_ascii=False)
+        
+        policy_scores = self.compute_policy_scores()
+        with open(data_folder / "policy_scores.json", 'w', encoding='utf-8') as f:
+            json.dump(policy_scores, f, indent=2, ensure_ascii=False)
+        
+        return topic_terms, policy_scores
+    
+    def report_artifacts(self, stats, topic_terms, policy_scores):
+        """
+        This run's results in the renderer's layout, so outputs an earlier
+        run left in the output folder (e.g. from a stage that was skipped
+        this time) do not end up in the report.
+        """
+        charts = set(self.charts_written)
+        data_files = {"extracted_texts.json", "corpus_statistics.json"}
+        assignments = []
+        if len(self.processed_docs) and self.topics is not None:
+            data_files.add("topic_assignments.csv")
+            assignments = [{'filename': doc.filename, 'topic': int(doc.topic)} for doc in self.processed_docs]
+        if self.temporal_results:
+            charts.add("topic_trends.png")
+            data_files.add("topic_prevalence_by_year.csv")
+            if 'incremental_topic_terms' in self.temporal_results:
+                data_files.add("incremental_topic_prevalence_by_year.csv")
+        if self.network_summary:
+            data_files.update(["coauthor_nodes.csv", "coauthor_edges.csv"])
+        
+        return {
+            'output_folder': self.output_folder,
+            'stats': stats,
+            'assignments': assignments,
+            'topic_terms': topic_terms,
+            'policy_scores': policy_scores,
+            'temporal': self.temporal_results,
+            'network': self.network_summary,
+            'charts': [chart for chart in CHARTS if chart[0] in charts],
+            'data_files': [entry for entry in DATA_FILES if entry[0] in data_files],
+        }
+    
+    def generate_report(self, stats):
+        """
+        Generate final landscape assessment report.
+        
+        The report is rendered by report_renderer from this run's results;
+        they are also persisted, so layout changes can be previewed with
+        `python report_renderer.py` without rerunning the analysis.
+        """
+        print("\nGenerating landscape assessment report...")
+        
+        topic_terms, policy_scores = self.save_report_artifacts()
+        artifacts = self.report_artifacts(stats, topic_terms, policy_scores)
+        report_path = write_report(self.output_folder, html_output=HTML_REPORT, artifacts=artifacts)
         
         print(f"\n✅ Report saved to: {report_path}")
         return report_path
 
-
 def main():
     """Main execution function."""
     print("="*70)
@@ -579,26 +773,33 @@ def main():
     print("HUMAINT Publications - Public Policy Assessment")
     print("="*70)
     
-    # Check if PDFs exist
-    if not Path(PDF_FOLDER).exists():
-        print(f"\n[ERROR] PDF folder '{PDF_FOLDER}' not found!")
-        return
-    
-    pdf_count = len(list(Path(PDF_FOLDER).glob("*.pdf")))
-    if pdf_count == 0:
-        print(f"\n[ERROR] No PDFs found in '{PDF_FOLDER}'!")
-        return
-    
-    print(f"\nFound {pdf_count} PDF files")
+    # Check if PDFs exist (the ingest pipeline downloads them itself)
+    if not INGEST_DOWNLOADS:
+        if not Path(PDF_FOLDER).exists():
+            print(f"\n[ERROR] PDF folder '{PDF_FOLDER}' not found!")
+            return
+        
+        pdf_count = len(list(Path(PDF_FOLDER).glob("*.pdf")))
+        if pdf_count == 0:
+            print(f"\n[ERROR] No PDFs found in '{PDF_FOLDER}'!")
+            return
+        
+        print(f"\nFound {pdf_count} PDF files")
     
     # Initialize analyzer
-    analyzer = LandscapeAnalyzer(PDF_FOLDER, OUTPUT_FOLDER)
+    if PREVIEW:
+        print(f"\nPREVIEW MODE {PREVIEW}: results are approximate")
+    analyzer = LandscapeAnalyzer(
+        PDF_FOLDER, OUTPUT_FOLDER + "_preview" if PREVIEW else OUTPUT_FOLDER,
+        spill_texts=SPILL_TEXTS, corpus_db=CORPUS_DB, preview=PREVIEW,
+        sandbox=SANDBOX_EXTRACTION
+    )
     
     # Step 1: Extract texts
     print("\n" + "="*70)
     print("STEP 1: TEXT EXTRACTION")
     print("="*70)
-    documents = analyzer.extract_texts()
+    documents = analyzer.extract_texts(download=INGEST_DOWNLOADS)
     
     if not documents:
         print("\n[ERROR] Could not extract text from any PDFs!")
@@ -628,26 +829,41 @@ def main():
     print("="*70)
     analyzer.perform_topic_modeling(n_topics=8)
     
-    # Step 5: Visualizations
+    # Step 5: Temporal Analysis
+    print("\n" + "="*70)
+    print("STEP 5: TEMPORAL ANALYSIS")
+    print("="*70)
+    analyzer.perform_temporal_analysis(n_topics=8)
+    
+    # Step 6: Co-authorship Network
+    print("\n" + "="*70)
+    print("STEP 6: CO-AUTHORSHIP NETWORK")
+    print("="*70)
+    analyzer.perform_network_analysis()
+    
+    # Step 7: Visualizations
     print("\n" + "="*70)
-    print("STEP 5: VISUALIZATIONS")
+    print("STEP 7: VISUALIZATIONS")
     print("="*70)
     analyzer.create_visualizations(stats)
     
-    # Step 6: Generate Report
+    # Step 8: Generate Report
     print("\n" + "="*70)
-    print("STEP 6: LANDSCAPE ASSESSMENT REPORT")
+    print("STEP 8: LANDSCAPE ASSESSMENT REPORT")
     print("="*70)
     report_path = analyzer.generate_report(stats)
+    analyzer.documents.close()
+    if analyzer.corpus_db:
+        analyzer.corpus_db.close()
     
     # Summary
     print("\n" + "="*70)
     print("[SUCCESS] ANALYSIS COMPLETE!")
     print("="*70)
-    print(f"\nAll outputs saved to: {OUTPUT_FOLDER}/")
+    print(f"\nAll outputs saved to: {analyzer.output_folder}/")
     print(f"\nMain report: {report_path}")
-    print(f"\nVisualizations: {OUTPUT_FOLDER}/visualizations/")
-    print(f"\nData files: {OUTPUT_FOLDER}/data/")
+    print(f"\nVisualizations: {analyzer.output_folder}/visualizations/")
+    print(f"\nData files: {analyzer.output_folder}/data/")
     print("\nReady for public policy analysis!")
 
 
@@ -1,31 +1,70 @@
 import requests
 from bs4 import BeautifulSoup
+import argparse
 import csv
+import json
+import os
+import re
 import time
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
+
+from http_client import HttpClient
+from rate_limiter import RETRY_STATUSES, RETRYABLE_ERRORS, RateLimiter
 
 BASE = "https://ai-watch.ec.europa.eu"
 PUBLICATIONS_URL = "https://ai-watch.ec.europa.eu/humaint/publications_en"
+CSV_FILE = "ai_watch_publications.csv"
+LISTING_CACHE = "listing_cache.json"   # Validators and parsed items per listing page
+LISTING_WORKERS = 4                    # Listing pages fetched in parallel
+FIELDNAMES = ["title", "publication_url", "pdf_link"]
+
+# Common domains for academic publications, matched in one pass per link
+PUBLICATION_DOMAINS = [
+    'arxiv.org', 'dl.acm.org', 'publications.jrc.ec.europa.eu',
+    'link.springer.com', 'ieeexplore.ieee.org', 'sciencedirect.com',
+    'tandfonline.com', 'iospress.nl', 'openreview.net',
+    'journalofbigdata.springeropen.com', 'worldscientific.com',
+    'scopus.com', 'ebooks.iospress.nl', 'dssc.eu', 'doi.org'
+]
+PUBLICATION_LINK = re.compile('|'.join(re.escape(domain) for domain in PUBLICATION_DOMAINS))
+
+HTTP = HttpClient()
+RATE_LIMITER = RateLimiter(rate=0.5)  # 2 seconds between requests to the same host
+
+def fetch_page(url, retries=3):
+    """
+    Fetch a page with retry logic for rate limiting and transient errors.
+    """
+    resp = fetch_response(url, retries)
+    return resp.text if resp is not None else None
 
-def fetch_page(url, retries=3, backoff_factor=2):
+def fetch_response(url, retries=3, headers=None):
     """
-    Fetch a page with retry logic for rate limiting.
+    Like fetch_page, but returns the response itself (304 for a conditional
+    request whose validators in `headers` still match).
     """
     for attempt in range(retries):
         try:
-            # Add delay before each request to respect rate limits
-            time.sleep(2)  # 2 seconds between requests
-            resp = requests.get(url)
+            # Paced per host; slows down further after 429/503 responses
+            RATE_LIMITER.acquire(url)
+            resp = HTTP.get(url, headers=headers)
             resp.raise_for_status()
-            return resp.text
+            RATE_LIMITER.record_success(url)
+            return resp
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:  # Too Many Requests
-                if attempt < retries - 1:
-                    wait_time = backoff_factor ** (attempt + 1)
-                    print(f"    Rate limited. Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
-                else:
-                    raise
+            if e.response.status_code in RETRY_STATUSES and attempt < retries - 1:
+                wait_time = RATE_LIMITER.backoff(url, attempt, e.response)
+                print(f"    HTTP {e.response.status_code}. Waiting {wait_time:.1f} seconds before retry...")
+                time.sleep(wait_time)
+            else:
+                raise
+        except RETRYABLE_ERRORS as e:
+            if attempt < retries - 1:
+                wait_time = RATE_LIMITER.backoff(url, attempt)
+                print(f"    {type(e).__name__}. Waiting {wait_time:.1f} seconds before retry...")
+                time.sleep(wait_time)
             else:
                 raise
     return None
@@ -35,39 +74,56 @@ def parse_publications_page(html):
     Retorna uma lista de (title, publication_url) para cada publicação.
     As publicações estão em <ul> dentro de <main>, com links diretos para publicações externas.
     """
+    items, _ = parse_listing(html, BASE)
+    return items
+
+def parse_listing(html, url):
+    """
+    Parse one listing page into (items, page_urls): the (title, publication_url)
+    pairs and the URLs of every other page of the listing, if it is paginated.
+    """
     soup = BeautifulSoup(html, "html.parser")
     items = []
     
     # Find the main content area
     main_content = soup.find('main')
     if not main_content:
-        return items
-    
-    # Common domains for academic publications
-    publication_domains = [
-        'arxiv.org', 'dl.acm.org', 'publications.jrc.ec.europa.eu',
-        'link.springer.com', 'ieeexplore.ieee.org', 'sciencedirect.com',
-        'tandfonline.com', 'iospress.nl', 'openreview.net',
-        'journalofbigdata.springeropen.com', 'worldscientific.com',
-        'scopus.com', 'ebooks.iospress.nl', 'dssc.eu', 'doi.org'
-    ]
+        return items, []
     
     # Find all ul elements within main content
-    ul_elements = main_content.find_all('ul')
-    
-    for ul in ul_elements:
-        list_items = ul.find_all('li', recursive=False)
-        for li in list_items:
+    for ul in main_content.find_all('ul'):
+        for li in ul.find_all('li', recursive=False):
             link = li.find('a', href=True)
             if link:
                 href = link.get('href')
                 # Check if this is an external publication link
-                if any(domain in href for domain in publication_domains):
+                if PUBLICATION_LINK.search(href):
                     title = li.get_text(strip=True)
                     publication_url = urljoin(BASE, href)
                     items.append((title, publication_url))
     
-    return items
+    return items, find_page_urls(soup, url)
+
+def page_url(url, page):
+    """URL of a listing page (Drupal pagers count from ?page=0)."""
+    parts = urlsplit(url)
+    query = {k: v for k, v in parse_qs(parts.query).items() if k != 'page'}
+    if page:
+        query['page'] = [str(page)]
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+def find_page_urls(soup, url):
+    """URLs of the other pages of a listing, read from its pager links."""
+    path = urlsplit(url).path
+    last_page = 0
+    for a in soup.find_all('a', href=re.compile(r'[?&]page=\d')):
+        parts = urlsplit(urljoin(url, a['href']))
+        if parts.path != path:
+            continue
+        for value in parse_qs(parts.query).get('page', []):
+            if value.isdigit():
+                last_page = max(last_page, int(value))
+    return [page_url(url, page) for page in range(1, last_page + 1)]
 
 def extract_pdf_link(publication_url):
     """
@@ -85,39 +141,146 @@ def extract_pdf_link(publication_url):
     # Para a maioria dos casos, não há PDF direto conhecido
     return None
 
-def scrape_publications(start_url):
+def load_listing_cache(path):
+    if Path(path).exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_json(data, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def fetch_listing_page(url, cache):
     """
-    Vasculhar publicações na página principal.
+    Fetch and parse one listing page, revalidating against the cached copy.
+    Returns (items, page_urls, changed); a 304 reuses the cached parse.
     """
-    results = []
+    entry = cache.get(url)
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    resp = fetch_response(url, headers=headers)
+    if resp.status_code == 304 and entry:
+        return [tuple(item) for item in entry['items']], entry['page_urls'], False
+
+    items, page_urls = parse_listing(resp.text, url)
+    cache[url] = {
+        'etag': resp.headers.get('ETag'),
+        'last_modified': resp.headers.get('Last-Modified'),
+        'items': items,
+        'page_urls': page_urls
+    }
+    return items, page_urls, True
+
+def scrape_publications(start_url, cache=None):
+    """
+    Vasculhar publicações na página principal (e nas demais páginas, se houver).
+    `cache` holds the listing validators from the previous run; unchanged
+    pages answer 304 and are not parsed again.
+    """
+    if cache is None:
+        cache = {}
     print("Fetching", start_url)
-    html = fetch_page(start_url)
-    pubs = parse_publications_page(html)
-    
-    print(f"\nFound {len(pubs)} publications\n")
-    
-    for title, publication_url in pubs:
-        print(f"  - {title[:80]}...")
-        
+    items, page_urls, changed = fetch_listing_page(start_url, cache)
+    pages_changed = int(changed)
+
+    if page_urls:
+        print(f"  Listing has {len(page_urls) + 1} pages")
+        with ThreadPoolExecutor(max_workers=LISTING_WORKERS) as executor:
+            for page_items, _, page_changed in executor.map(
+                    lambda url: fetch_listing_page(url, cache), page_urls):
+                items.extend(page_items)
+                pages_changed += page_changed
+    print(f"  {pages_changed} of {len(page_urls) + 1} listing pages changed since the last run")
+
+    results = []
+    seen = set()
+    for title, publication_url in items:
+        if publication_url in seen:
+            continue
+        seen.add(publication_url)
         # Try to extract direct PDF link without fetching the page
         pdf_link = extract_pdf_link(publication_url)
-        
         results.append({
             "title": title,
             "publication_url": publication_url,
             "pdf_link": pdf_link if pdf_link else "N/A"
         })
     
+    print(f"\nFound {len(results)} publications")
     return results
 
+def load_csv(path):
+    if not Path(path).exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def merge_catalog(existing, scraped):
+    """
+    Merge scraped entries into the existing catalog, keyed by publication URL.
+
+    Existing rows keep their position and any PDF link already recorded;
+    new publications are appended and entries missing from the listing are
+    kept. Returns (rows, counts).
+    """
+    rows = [dict(row) for row in existing]
+    by_url = {row['publication_url']: row for row in rows}
+    counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+    for pub in scraped:
+        row = by_url.get(pub['publication_url'])
+        if row is None:
+            rows.append(pub)
+            by_url[pub['publication_url']] = pub
+            counts['new'] += 1
+            print(f"  + {pub['title'][:80]}...")
+            continue
+        pdf_link = row['pdf_link'] if row['pdf_link'] != 'N/A' else pub['pdf_link']
+        if row['title'] != pub['title'] or row['pdf_link'] != pdf_link:
+            row['title'] = pub['title']
+            row['pdf_link'] = pdf_link
+            counts['changed'] += 1
+            print(f"  ~ {pub['title'][:80]}...")
+        else:
+            counts['unchanged'] += 1
+    counts['unlisted'] = len(rows) - counts['new'] - counts['changed'] - counts['unchanged']
+    return rows, counts
+
 def save_csv(data, path):
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["title", "publication_url", "pdf_link"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
         writer.writeheader()
         for row in data:
             writer.writerow(row)
+    os.replace(tmp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the HUMAINT publication listing")
+    parser.add_argument('--full', action='store_true',
+                        help="fetch every listing page even if unchanged since the last run")
+    args = parser.parse_args()
+
+    cache_path = Path(CSV_FILE).with_name(LISTING_CACHE)
+    cache = {} if args.full else load_listing_cache(cache_path)
+    data = scrape_publications(PUBLICATIONS_URL, cache)
+    rows, counts = merge_catalog(load_csv(CSV_FILE), data)
+    if counts['new'] or counts['changed'] or not Path(CSV_FILE).exists():
+        save_csv(rows, CSV_FILE)
+    save_json(cache, cache_path)
+
+    print(f"\nSalvo em {CSV_FILE} — total: {len(rows)} publicações "
+          f"({counts['new']} novas, {counts['changed']} alteradas, "
+          f"{counts['unlisted']} fora da listagem atual)")
+    print(f"Conexões HTTP: {HTTP.format_stats()}")
+    print(f"Limite de taxa: {RATE_LIMITER.format_stats()}")
 
 if __name__ == "__main__":
-    data = scrape_publications(PUBLICATIONS_URL)
-    save_csv(data, "ai_watch_publications.csv")
-    print(f"\nSalvo em ai_watch_publications.csv — total: {len(data)} publicações")
+    main()
@@ -1,29 +1,130 @@
+import argparse
+import hashlib
+import os
 import shutil
 from pathlib import Path
 
+# Configuration
+FOLDERS = ['downloaded_images', 'optimized_images']   # Synced into slide-app/public/assets
+SOURCE_ROOT = Path(__file__).parent
+DEST_ROOT = Path(__file__).parent.parent / 'slide-app' / 'public' / 'assets'
+
+# Copy-on-write clone (Linux FICLONE ioctl); fails on filesystems without reflinks
+try:
+    import fcntl
+    FICLONE = 0x40049409
+except ImportError:
+    fcntl = None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_current(source, dest, checksum=False):
+    """Whether dest already matches source (size and mtime, or content with checksum)."""
+    if not dest.exists():
+        return False
+    if os.path.samefile(source, dest):
+        return True
+    source_stat, dest_stat = source.stat(), dest.stat()
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if checksum:
+        return file_sha256(source) == file_sha256(dest)
+    return int(source_stat.st_mtime) == int(dest_stat.st_mtime)
+
+
+def place_file(source, dest):
+    """
+    Put source at dest as a hardlink, a reflink or a copy, whichever works
+    first. Returns the method used. The file is written beside dest and
+    renamed over it, so the app never serves a half-written file.
+    """
+    tmp_path = dest.with_name(f".{dest.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    try:
+        os.link(source, tmp_path)
+        method = 'link'
+    except OSError:
+        method = 'copy'
+        if fcntl is not None:
+            try:
+                with open(source, 'rb') as src, open(tmp_path, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, tmp_path)
+                method = 'reflink'
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+        if method == 'copy':
+            shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, dest)
+    return method
+
+
+def sync_folder(source_dir, dest_dir, dry_run=False, checksum=False, prune=True):
+    """Mirror source_dir into dest_dir. Returns counts of what changed."""
+    counts = {'new': 0, 'updated': 0, 'unchanged': 0, 'pruned': 0}
+    if not dry_run:
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+    sources = {path.name: path for path in source_dir.iterdir() if path.is_file()}
+    for name, source in sorted(sources.items()):
+        dest = dest_dir / name
+        if is_current(source, dest, checksum):
+            counts['unchanged'] += 1
+            continue
+        status = 'updated' if dest.exists() else 'new'
+        counts[status] += 1
+        if dry_run:
+            print(f"  would {'update' if status == 'updated' else 'add'}: {name}")
+        else:
+            method = place_file(source, dest)
+            print(f"✓ {status.capitalize()} ({method}): {name}")
+
+    if prune and dest_dir.exists():
+        for dest in sorted(dest_dir.iterdir()):
+            if dest.is_file() and dest.name not in sources:
+                counts['pruned'] += 1
+                if dry_run:
+                    print(f"  would remove: {dest.name}")
+                else:
+                    dest.unlink()
+                    print(f"✗ Removed: {dest.name}")
+    return counts
+
+
 def main():
-    # Source directory
-    source_dir = Path(__file__).parent / 'downloaded_images'
-    
-    # Destination directory
-    dest_dir = Path(__file__).parent.parent / 'slide-app' / 'public' / 'assets' / 'downloaded_images'
-    
-    # Create destination directory if it doesn't exist
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Copy all images
-    if source_dir.exists():
-        copied = 0
-        for image_file in source_dir.glob('*'):
-            if image_file.is_file():
-                dest_file = dest_dir / image_file.name
-                shutil.copy2(image_file, dest_file)
-                print(f"✓ Copied: {image_file.name}")
-                copied += 1
-        
-        print(f"\n✅ Copied {copied} images to {dest_dir}")
-    else:
-        print(f"⚠ Source directory not found: {source_dir}")
+    parser = argparse.ArgumentParser(description="Sync slide images into the slide-app assets")
+    parser.add_argument('--dry-run', action='store_true', help="report changes without touching files")
+    parser.add_argument('--checksum', action='store_true',
+                        help="compare file contents instead of size and modification time")
+    parser.add_argument('--no-prune', action='store_true',
+                        help="keep files in the app that no longer exist in the source")
+    args = parser.parse_args()
+
+    total = {'new': 0, 'updated': 0, 'unchanged': 0, 'pruned': 0}
+    for folder in FOLDERS:
+        source_dir = SOURCE_ROOT / folder
+        dest_dir = DEST_ROOT / folder
+        if not source_dir.exists():
+            print(f"⚠ Source directory not found: {source_dir}")
+            continue
+        counts = sync_folder(source_dir, dest_dir, args.dry_run, args.checksum, not args.no_prune)
+        for key, value in counts.items():
+            total[key] += value
+
+    changed = total['new'] + total['updated'] + total['pruned']
+    prefix = "Dry run: would sync" if args.dry_run else "Synced"
+    print(f"\n✅ {prefix} {total['new']} new, {total['updated']} updated, "
+          f"{total['pruned']} removed, {total['unchanged']} unchanged")
+    if not changed:
+        print("   Assets already up to date")
 
 if __name__ == '__main__':
     main()
@@ -1,102 +1,200 @@
+import hashlib
 import json
 import os
+import threading
 import requests
-from urllib.parse import urlparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse, unquote
 from pathlib import Path
 
+# Configuration
+MAX_WORKERS = 6          # Images downloaded in parallel
+CHUNK_SIZE = 64 * 1024   # Bytes read per chunk while streaming to disk
+HEADERS = {
+    # Headers to avoid 403 errors
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Magic bytes at the start of each format, checked on the first chunk of the GET
+IMAGE_SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'GIF87a', '.gif'),
+    (b'GIF89a', '.gif'),
+]
+CONTENT_TYPE_EXTENSIONS = [('png', '.png'), ('jpeg', '.jpg'), ('jpg', '.jpg'),
+                           ('svg', '.svg'), ('webp', '.webp'), ('gif', '.gif')]
+
+
+class NotAnImage(Exception):
+    """The server answered with something that is not an image (e.g. an HTML error page)."""
+
+
+def make_session():
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+SESSION = make_session()
+
+
+def sniff_extension(head):
+    """Guess the image extension from the first bytes of the body."""
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    if head[4:12] in (b'ftypavif', b'ftypavis'):
+        return '.avif'
+    text = head[:512].lstrip().lower()
+    if text.startswith(b'<svg') or (text.startswith(b'<?xml') and b'<svg' in head.lower()):
+        return '.svg'
+    return None
+
+
+def url_filename(url):
+    """Filename from the URL path, or None when it has no extension."""
+    filename = unquote(os.path.basename(urlparse(url).path))
+    return filename if filename and '.' in filename else None
+
+
+def cached_file(url, output_dir):
+    """Filename of a previous download of `url` in output_dir, if any."""
+    filename = url_filename(url)
+    if filename:
+        return filename if (output_dir / filename).exists() else None
+    # Extensionless URLs are saved as <md5 of URL><sniffed extension>
+    hash_name = hashlib.md5(url.encode()).hexdigest()
+    for path in output_dir.glob(f"{hash_name}.*"):
+        if not path.name.endswith('.part'):
+            return path.name
+    return None
+
+
+# URLs sharing a basename save to the same file, so only one of them downloads at a time
+TARGET_LOCKS = defaultdict(threading.Lock)
+TARGET_LOCKS_GUARD = threading.Lock()
+
+
+def target_lock(output_dir, url):
+    name = url_filename(url) or hashlib.md5(url.encode()).hexdigest()
+    with TARGET_LOCKS_GUARD:
+        return TARGET_LOCKS[output_dir / name]
+
+
 def download_image(url, output_dir):
     """Download an image from URL and save it locally."""
+    output_dir = Path(output_dir)
+    with target_lock(output_dir, url):
+        return fetch_image(url, output_dir)
+
+
+def fetch_image(url, output_dir):
     try:
-        # Headers to avoid 403 errors
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        # Parse the URL to get filename
-        parsed = urlparse(url)
-        filename = os.path.basename(parsed.path)
-        
-        # Clean up filename (remove URL encoding)
-        from urllib.parse import unquote
-        filename = unquote(filename)
-        
-        # If no filename, generate one from the URL
-        if not filename or '.' not in filename:
-            # Use a hash of the URL as filename
-            import hashlib
-            hash_name = hashlib.md5(url.encode()).hexdigest()
-            # Try to get extension from content-type
-            response = requests.head(url, headers=headers, timeout=10)
-            content_type = response.headers.get('content-type', '')
-            ext = '.jpg'  # default
-            if 'png' in content_type:
-                ext = '.png'
-            elif 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'svg' in content_type:
-                ext = '.svg'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            filename = f"{hash_name}{ext}"
-        
-        output_path = os.path.join(output_dir, filename)
-        
-        # Skip if already exists
-        if os.path.exists(output_path):
+        filename = cached_file(url, output_dir)
+        if filename:
             print(f"✓ Already exists: {filename}")
             return filename
-        
-        # Download the image
+
         print(f"⬇ Downloading: {url}")
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Save to file
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
-        
+        with SESSION.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+            head = next(chunks, b'')
+            ext = sniff_extension(head)
+            content_type = response.headers.get('content-type', '').lower()
+            looks_like_html = head[:256].lstrip().lower().startswith((b'<!doctype html', b'<html'))
+            if ext is None and (looks_like_html or not content_type.startswith('image/')):
+                raise NotAnImage(f"response is not an image (Content-Type: {content_type or 'none'})")
+
+            filename = url_filename(url)
+            if filename is None:
+                # The format comes from the body itself, so no HEAD request is needed
+                if ext is None:
+                    ext = next((e for key, e in CONTENT_TYPE_EXTENSIONS if key in content_type), '.jpg')
+                filename = hashlib.md5(url.encode()).hexdigest() + ext
+
+            # Stream to a temporary file so an interrupted download never looks complete
+            output_path = output_dir / filename
+            part_path = output_path.with_name(output_path.name + '.part')
+            try:
+                with open(part_path, 'wb') as f:
+                    f.write(head)
+                    for chunk in chunks:
+                        f.write(chunk)
+                os.replace(part_path, output_path)
+            finally:
+                # Left behind only when the stream failed partway
+                part_path.unlink(missing_ok=True)
+
         print(f"✓ Saved: {filename}")
         return filename
-        
+
     except Exception as e:
         print(f"✗ Error downloading {url}: {e}")
         return None
 
-def main():
-    # Load the JSON file
-    json_path = Path(__file__).parent / 'content-en.json'
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Create output directory
-    output_dir = Path(__file__).parent / 'downloaded_images'
-    output_dir.mkdir(exist_ok=True)
-    
-    # Track URLs and their local paths
-    url_mapping = {}
-    
-    # Extract all image URLs from the JSON
+
+def collect_image_urls(data):
+    """External image URLs in a content JSON, in order of first appearance."""
+    urls = []
     for segment in data.get('segments', []):
-        media_list = segment.get('media', [])
-        for media in media_list:
+        for media in segment.get('media', []):
             if media.get('type') == 'image':
                 src = media.get('src', '')
                 # Only download external URLs (http/https)
-                if src.startswith('http://') or src.startswith('https://'):
-                    print(f"\n📷 Processing: {src}")
-                    local_filename = download_image(src, str(output_dir))
-                    if local_filename:
-                        url_mapping[src] = f"downloaded_images/{local_filename}"
-    
-    # Save the mapping to a file for reference
+                if src.startswith(('http://', 'https://')) and src not in urls:
+                    urls.append(src)
+    return urls
+
+
+def main():
+    # Load every language's JSON file; images shared between them are fetched once
+    urls = []
+    for json_path in sorted(Path(__file__).parent.glob('content-*.json')):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            urls.extend(collect_image_urls(json.load(f)))
+    urls = list(dict.fromkeys(urls))
+
+    # Create output directory
+    output_dir = Path(__file__).parent / 'downloaded_images'
+    output_dir.mkdir(exist_ok=True)
+
+    # Earlier runs' mappings are kept: once the content JSON points at local
+    # files, their URLs no longer appear in it
     mapping_path = Path(__file__).parent / 'image_url_mapping.json'
-    with open(mapping_path, 'w', encoding='utf-8') as f:
+    url_mapping = {}
+    if mapping_path.exists():
+        with open(mapping_path, 'r', encoding='utf-8') as f:
+            url_mapping = json.load(f)
+
+    print(f"📷 {len(urls)} external images, {MAX_WORKERS} parallel downloads\n")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(lambda url: download_image(url, output_dir), urls))
+
+    saved = 0
+    for url, local_filename in zip(urls, results):
+        if local_filename:
+            url_mapping[url] = f"downloaded_images/{local_filename}"
+            saved += 1
+
+    # Save the mapping once, atomically
+    tmp_path = mapping_path.with_name(mapping_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(url_mapping, f, indent=2)
-    
-    print(f"\n✅ Done! Downloaded {len(url_mapping)} images")
+    os.replace(tmp_path, mapping_path)
+
+    print(f"\n✅ Done! {saved} of {len(urls)} images available locally")
     print(f"📄 URL mapping saved to: {mapping_path}")
-    print(f"\n💡 To use local images, update the 'src' fields in content-en.json")
-    print(f"   from the URLs to the local paths in image_url_mapping.json")
+    print(f"\n💡 Run update_json_with_local_images.py to point every content-*.json")
+    print(f"   at the local copies listed in image_url_mapping.json")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+# Configuration
+WIDTHS = [640, 1280, 1920]   # Variant widths in pixels (never upscaled)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+OPTIMIZER_VERSION = 1        # Bump to invalidate cached variants after changing the encoding
+RASTER_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+
+SOURCE_DIR = Path(__file__).parent / 'downloaded_images'
+OUTPUT_DIR = Path(__file__).parent / 'optimized_images'
+# Inside OUTPUT_DIR so it is synced to the app with the variants; its paths are
+# relative to the assets root
+MANIFEST_PATH = OUTPUT_DIR / 'image_variants.json'
+
+
+def settings_key():
+    """Everything besides the source bytes that changes the output files."""
+    return f"v{OPTIMIZER_VERSION}:{','.join(map(str, WIDTHS))}:webp{WEBP_QUALITY}:jpeg{JPEG_QUALITY}"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def target_widths(width):
+    """Configured widths below the original, plus the original if it is smaller than the largest."""
+    widths = [w for w in WIDTHS if w < width]
+    if width < WIDTHS[-1] or not widths:
+        widths.append(min(width, WIDTHS[-1]))
+    return widths
+
+
+def optimize_image(source, cache_key):
+    """
+    Write resized WebP variants and a JPEG (PNG with transparency) fallback.
+
+    Orientation from EXIF is applied to the pixels and then all metadata
+    (EXIF, ICC, XMP) is dropped. Returns the manifest entry.
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        width, height = image.size
+
+        variants = []
+        for target in target_widths(width):
+            resized = image if target == width else image.resize(
+                (target, round(height * target / width)), Image.LANCZOS
+            )
+            stem = f"{source.stem}-{target}w-{cache_key[:10]}"
+            outputs = [('webp', stem + '.webp', {'quality': WEBP_QUALITY, 'method': 6})]
+            if has_alpha:
+                outputs.append(('png', stem + '.png', {'optimize': True}))
+            else:
+                outputs.append(('jpeg', stem + '.jpg',
+                                {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True}))
+            for fmt, name, options in outputs:
+                # Fresh image objects carry no EXIF/ICC, so nothing is copied over
+                resized.save(OUTPUT_DIR / name, fmt.upper(), **options)
+                variants.append({
+                    'src': f"{OUTPUT_DIR.name}/{name}",
+                    'format': fmt,
+                    'width': resized.width,
+                    'height': resized.height,
+                    'bytes': (OUTPUT_DIR / name).stat().st_size
+                })
+
+    return {
+        'cache_key': cache_key,
+        'width': width,
+        'height': height,
+        'bytes': source.stat().st_size,
+        'variants': variants
+    }
+
+
+def entry_is_current(entry, cache_key):
+    return (entry is not None and entry.get('cache_key') == cache_key
+            and all((OUTPUT_DIR.parent / v['src']).exists() for v in entry['variants']))
+
+
+def served_bytes(entry):
+    """Bytes a full-width display downloads: the largest WebP variant."""
+    webp = [v for v in entry['variants'] if v['format'] == 'webp']
+    return max(webp, key=lambda v: v['width'])['bytes'] if webp else entry['bytes']
+
+
+def main():
+    if not SOURCE_DIR.exists():
+        print(f"⚠ Source directory not found: {SOURCE_DIR}")
+        return
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+    manifest = {}
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f).get('images', {})
+
+    settings = settings_key()
+    images = {}
+    optimized = cached = 0
+    for source in sorted(SOURCE_DIR.iterdir()):
+        if not source.is_file() or source.suffix.lower() not in RASTER_EXTENSIONS:
+            continue
+        key = f"{SOURCE_DIR.name}/{source.name}"
+        cache_key = hashlib.sha256(f"{file_sha256(source)}:{settings}".encode()).hexdigest()
+        entry = manifest.get(key)
+        if entry_is_current(entry, cache_key):
+            cached += 1
+        else:
+            try:
+                entry = optimize_image(source, cache_key)
+            except (OSError, Image.DecompressionBombError) as e:
+                print(f"✗ Could not optimize {source.name}: {e}")
+                continue
+            optimized += 1
+        images[key] = entry
+        print(f"✓ {source.name}: {entry['bytes'] / 1024:.0f} KB → "
+              f"{served_bytes(entry) / 1024:.0f} KB ({len(entry['variants'])} variants)")
+
+    # Variants whose source or settings are gone
+    current = {Path(v['src']).name for entry in images.values() for v in entry['variants']}
+    removed = 0
+    for path in OUTPUT_DIR.iterdir():
+        if path.is_file() and path.name not in current and path != MANIFEST_PATH:
+            path.unlink()
+            removed += 1
+
+    original_bytes = sum(entry['bytes'] for entry in images.values())
+    optimized_bytes = sum(served_bytes(entry) for entry in images.values())
+    tmp_path = MANIFEST_PATH.with_name(MANIFEST_PATH.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'settings': settings,
+            'images': images,
+            'original_bytes': original_bytes,
+            'optimized_bytes': optimized_bytes
+        }, f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+    saved = original_bytes - optimized_bytes
+    share = saved / original_bytes if original_bytes else 0
+    print(f"\n✅ {len(images)} images ({optimized} optimized, {cached} cached, "
+          f"{removed} stale variants removed)")
+    print(f"📉 {original_bytes / 1024 / 1024:.1f} MB → {optimized_bytes / 1024 / 1024:.1f} MB "
+          f"at full width ({saved / 1024 / 1024:.1f} MB saved, {share:.0%})")
+    print(f"📄 Variant manifest saved to: {MANIFEST_PATH}")
+
+if __name__ == '__main__':
+    main()
@@ -1,43 +1,158 @@
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def main():
-    # Load the mapping
-    mapping_path = Path(__file__).parent / 'image_url_mapping.json'
-    with open(mapping_path, 'r', encoding='utf-8') as f:
-        url_mapping = json.load(f)
-    
-    # Load the content JSON
-    json_path = Path(__file__).parent / 'content-en.json'
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Track changes
-    changes_made = 0
-    
-    # Update all image URLs in the JSON
+from download_images import MAX_WORKERS, collect_image_urls, download_image
+
+# Configuration
+CONTENT_DIR = Path(__file__).parent
+IMAGES_DIR = CONTENT_DIR / 'downloaded_images'
+MAPPING_PATH = CONTENT_DIR / 'image_url_mapping.json'   # Shared by every language
+APP_PREFIX = 'assets/'   # Local images are served from slide-app/public/assets
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_content_files():
+    """Every content-*.json as {path: (data, original text)}."""
+    contents = {}
+    for json_path in sorted(CONTENT_DIR.glob('content-*.json')):
+        text = json_path.read_text(encoding='utf-8')
+        contents[json_path] = (json.loads(text), text)
+    return contents
+
+
+def fetch_missing(urls, url_mapping):
+    """Download URLs not in the mapping (or whose file is gone), each once."""
+    missing = [url for url in urls
+               if url not in url_mapping or not (CONTENT_DIR / url_mapping[url]).exists()]
+    if not missing:
+        return 0
+    print(f"📷 Downloading {len(missing)} images ({MAX_WORKERS} in parallel)\n")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(lambda url: download_image(url, IMAGES_DIR), missing))
+    fetched = 0
+    for url, local_filename in zip(missing, results):
+        if local_filename:
+            url_mapping[url] = f"{IMAGES_DIR.name}/{local_filename}"
+            fetched += 1
+    return fetched
+
+
+def dedupe_by_content(url_mapping):
+    """
+    Point URLs whose files have identical bytes at one file. Returns
+    {duplicate local path: canonical local path}; the duplicates are left on
+    disk until the rewritten JSON files are in place (see remove_duplicates).
+    """
+    canonical = {}
+    replaced = {}
+    for local_path in dict.fromkeys(url_mapping.values()):
+        path = CONTENT_DIR / local_path
+        if not path.exists():
+            continue
+        digest = file_sha256(path)
+        if digest in canonical:
+            replaced[local_path] = canonical[digest]
+        else:
+            canonical[digest] = local_path
+
+    for url, local_path in url_mapping.items():
+        url_mapping[url] = replaced.get(local_path, local_path)
+    return replaced
+
+
+def remove_duplicates(replaced):
+    """Delete duplicate image files once nothing references them any more."""
+    for local_path, kept in replaced.items():
+        (CONTENT_DIR / local_path).unlink(missing_ok=True)
+        print(f"♻ Same image as {kept}: removed {local_path}")
+
+
+def rewrite_sources(data, url_mapping, replaced):
+    """Point image media at local copies. Returns the number of changed sources."""
+    changes = 0
     for segment in data.get('segments', []):
-        media_list = segment.get('media', [])
-        for media in media_list:
-            if media.get('type') == 'image':
-                src = media.get('src', '')
-                # Check if we have a local version
-                if src in url_mapping:
-                    old_src = media['src']
-                    # Update path to use assets/ prefix for the app
-                    local_path = url_mapping[src]
-                    media['src'] = f"assets/{local_path}"
-                    print(f"✓ Updated: {old_src}")
-                    print(f"  → {media['src']}")
-                    changes_made += 1
-    
-    # Save the updated JSON
-    if changes_made > 0:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"\n✅ Updated {changes_made} image references in content-en.json")
-    else:
-        print("\n⚠ No changes made - all images already using local paths or not found in mapping")
+        for media in segment.get('media', []):
+            if media.get('type') != 'image':
+                continue
+            src = media.get('src', '')
+            if src in url_mapping:
+                new_src = APP_PREFIX + url_mapping[src]
+            elif src.startswith(APP_PREFIX) and src[len(APP_PREFIX):] in replaced:
+                new_src = APP_PREFIX + replaced[src[len(APP_PREFIX):]]
+            else:
+                continue
+            if new_src != src:
+                media['src'] = new_src
+                changes += 1
+    return changes
+
+
+def write_atomically(outputs):
+    """Write {path: text} so that either every file is replaced or none is."""
+    tmp_paths = []
+    try:
+        for path, text in outputs.items():
+            tmp_path = path.with_name(path.name + '.tmp')
+            tmp_path.write_text(text, encoding='utf-8')
+            tmp_paths.append((tmp_path, path))
+    except OSError:
+        for tmp_path, _ in tmp_paths:
+            tmp_path.unlink(missing_ok=True)
+        raise
+    for tmp_path, path in tmp_paths:
+        os.replace(tmp_path, path)
+
+
+def main():
+    contents = load_content_files()
+    if not contents:
+        print(f"⚠ No content-*.json files in {CONTENT_DIR}")
+        return
+    IMAGES_DIR.mkdir(exist_ok=True)
+
+    # Load the shared mapping
+    url_mapping = {}
+    if MAPPING_PATH.exists():
+        with open(MAPPING_PATH, 'r', encoding='utf-8') as f:
+            url_mapping = json.load(f)
+
+    # External images across all languages, each URL once
+    urls = list(dict.fromkeys(
+        url for data, _ in contents.values() for url in collect_image_urls(data)
+    ))
+    print(f"🌐 {len(contents)} content files, {len(urls)} distinct external images")
+    fetched = fetch_missing(urls, url_mapping)
+    replaced = dedupe_by_content(url_mapping)
+
+    outputs = {}
+    for json_path, (data, text) in contents.items():
+        changes = rewrite_sources(data, url_mapping, replaced)
+        if changes:
+            new_text = json.dumps(data, indent=2, ensure_ascii=False)
+            if text.endswith('\n'):
+                new_text += '\n'
+            outputs[json_path] = new_text
+            print(f"✓ {json_path.name}: {changes} image references updated")
+    outputs[MAPPING_PATH] = json.dumps(url_mapping, indent=2)
+    write_atomically(outputs)
+    # Only now: had the write failed, the old JSON would still point at these files
+    remove_duplicates(replaced)
+
+    remote = [url for url in urls if url not in url_mapping]
+    print(f"\n✅ {fetched} downloaded, {len(replaced)} duplicates merged, "
+          f"{len(outputs) - 1} content files rewritten")
+    if remote:
+        print(f"⚠ {len(remote)} images could not be downloaded and keep their remote URL")
 
 if __name__ == '__main__':
     main()
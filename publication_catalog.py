@@ -0,0 +1,208 @@
+"""
+Typed publication catalog
+Parses ai_watch_publications.csv once into per-publication columns (authors,
+year, clean title, DOI, arXiv ID, host and the downloader's filename) and
+stores them in a columnar file, so analysis scripts load only the columns
+they need instead of re-running the title regexes
+
+Usage:
+    python publication_catalog.py            # rebuild if the CSV changed
+    python publication_catalog.py --rebuild
+"""
+
+import argparse
+import csv
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from coauthor_network import parse_authors
+from publication_names import extract_first_author, generate_filename, infer_publication_year
+
+# Parquet needs pyarrow (or fastparquet); without it the catalog is a typed CSV
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        PARQUET_AVAILABLE = True
+    except ImportError:
+        PARQUET_AVAILABLE = False
+
+# Configuration
+CSV_FILE = "ai_watch_publications.csv"
+CATALOG_NAME = "publication_catalog"
+CATALOG_VERSION = 1     # Bump when COLUMNS or parse_publication change, so existing catalogs are rebuilt
+VERSION_KEY = "catalog_version"
+CSV_VERSION_PREFIX = "# catalog_version: "   # First line of the CSV fallback
+LIST_SEPARATOR = "; "   # Joins list columns in the CSV fallback
+
+DOI_PATTERN = re.compile(r'\b(10\.\d{4,9}/[^\s?#]+)')
+ARXIV_PATTERN = re.compile(r'arxiv\.org/(?:abs|pdf)/(\d{4}\.\d{4,5})')
+
+# Column -> pandas dtype; list columns hold strings
+COLUMNS = {
+    'position': 'int32',         # 1-based row in the CSV (the downloader's index)
+    'filename': 'string',
+    'title': 'string',           # Raw catalog entry, authors included
+    'clean_title': 'string',
+    'first_author': 'string',
+    'authors': 'object',         # Display names, "Surname, I."
+    'author_keys': 'object',     # normalize_author keys, same order
+    'year': 'Int16',
+    'doi': 'string',
+    'arxiv_id': 'string',
+    'host': 'string',
+    'publication_url': 'string',
+    'pdf_link': 'string'
+}
+LIST_COLUMNS = ['authors', 'author_keys']
+
+
+def catalog_path(csv_file=CSV_FILE):
+    """Where the catalog for `csv_file` lives (next to it)."""
+    suffix = '.parquet' if PARQUET_AVAILABLE else '.csv'
+    return Path(csv_file).with_name(CATALOG_NAME + suffix)
+
+
+def parse_publication(position, pub):
+    """One catalog row from a CSV entry."""
+    url = pub['publication_url']
+    authors, clean_title = parse_authors(pub['title'])
+    doi = DOI_PATTERN.search(url)
+    arxiv = ARXIV_PATTERN.search(url)
+    host = urlsplit(url).hostname or ''
+    return {
+        'position': position,
+        'filename': generate_filename(pub['title'], pub['pdf_link'], position),
+        'title': pub['title'],
+        'clean_title': clean_title.strip(' ,.;:') or pub['title'],
+        'first_author': extract_first_author(pub['title']),
+        'authors': [name for _, name in authors],
+        'author_keys': [key for key, _ in authors],
+        'year': infer_publication_year(pub['title'], url),
+        'doi': doi.group(1).rstrip('.') if doi else None,
+        'arxiv_id': arxiv.group(1) if arxiv else None,
+        'host': host[4:] if host.startswith('www.') else host,
+        'publication_url': url,
+        'pdf_link': pub['pdf_link']
+    }
+
+
+def build_catalog(csv_file=CSV_FILE, path=None):
+    """Parse the CSV and write the catalog. Returns the catalog DataFrame."""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        publications = list(csv.DictReader(f))
+
+    catalog = pd.DataFrame(
+        [parse_publication(i, pub) for i, pub in enumerate(publications, 1)],
+        columns=list(COLUMNS)
+    ).astype(COLUMNS)
+
+    path = Path(path) if path else catalog_path(csv_file)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if path.suffix == '.parquet':
+        write_parquet(catalog, tmp_path)
+    else:
+        flat = catalog.copy()
+        for column in LIST_COLUMNS:
+            flat[column] = flat[column].map(LIST_SEPARATOR.join)
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(f"{CSV_VERSION_PREFIX}{CATALOG_VERSION}\n")
+            flat.to_csv(f, index=False)
+    tmp_path.replace(path)
+    return catalog
+
+
+def write_parquet(catalog, path):
+    """Write the catalog with CATALOG_VERSION in the file's key/value metadata."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        catalog.to_parquet(path, index=False, engine='fastparquet',
+                           custom_metadata={VERSION_KEY: str(CATALOG_VERSION)})
+        return
+    table = pa.Table.from_pandas(catalog, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[VERSION_KEY.encode()] = str(CATALOG_VERSION).encode()
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def stored_version(path):
+    """CATALOG_VERSION a catalog file was written with, or None if unknown."""
+    try:
+        if path.suffix == '.parquet':
+            try:
+                import pyarrow.parquet as pq
+                metadata = pq.read_schema(path).metadata or {}
+                value = metadata.get(VERSION_KEY.encode())
+            except ImportError:
+                import fastparquet
+                value = fastparquet.ParquetFile(str(path)).key_value_metadata.get(VERSION_KEY)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                first_line = f.readline().strip()
+            value = first_line[len(CSV_VERSION_PREFIX):] if first_line.startswith(CSV_VERSION_PREFIX) else None
+        return int(value) if value is not None else None
+    except (OSError, ValueError):
+        return None
+
+
+def ensure_catalog(csv_file=CSV_FILE):
+    """Return the catalog path, rebuilding it when the CSV is newer or the schema changed."""
+    path = catalog_path(csv_file)
+    if (not path.exists() or path.stat().st_mtime < Path(csv_file).stat().st_mtime
+            or stored_version(path) != CATALOG_VERSION):
+        build_catalog(csv_file, path)
+    return path
+
+
+def load_catalog(csv_file=CSV_FILE, columns=None):
+    """
+    Load the catalog, or only `columns` of it, with its dtypes.
+
+    List columns come back as sequences of strings in either format.
+    """
+    path = ensure_catalog(csv_file)
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, columns=columns)
+
+    wanted = columns or list(COLUMNS)
+    catalog = pd.read_csv(
+        path, skiprows=1, usecols=wanted, keep_default_na=False, na_values=[''],
+        dtype={c: t for c, t in COLUMNS.items() if c in wanted and c not in LIST_COLUMNS}
+    )[wanted]
+    for column in LIST_COLUMNS:
+        if column in catalog:
+            catalog[column] = catalog[column].map(
+                lambda value: value.split(LIST_SEPARATOR) if isinstance(value, str) else []
+            )
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the typed publication catalog")
+    parser.add_argument('--rebuild', action='store_true', help="rebuild even if up to date")
+    args = parser.parse_args()
+
+    if not Path(CSV_FILE).exists():
+        print(f"Error: {CSV_FILE} not found!")
+        return
+
+    if args.rebuild:
+        build_catalog(CSV_FILE)
+    path = ensure_catalog(CSV_FILE)
+    catalog = load_catalog(CSV_FILE)
+    print(f"Catalog: {path} ({len(catalog)} publications)")
+    print(f"  With year:   {catalog['year'].notna().sum()}")
+    print(f"  With DOI:    {catalog['doi'].notna().sum()}")
+    print(f"  With arXiv:  {catalog['arxiv_id'].notna().sum()}")
+    print(f"  Hosts:       {catalog['host'].nunique()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Publication naming helpers
+Derives PDF filenames, first authors and publication years from the catalog's
+title text. Shared by the downloader and the analysis scripts, so it only
+uses the standard library
+"""
+
+import re
+
+# Configuration
+MAX_FILENAME_LENGTH = 80
+
+# Identifiers that encode the publication year when the title does not
+ARXIV_ID_PATTERN = re.compile(r'arxiv\.org/(?:abs|pdf)/(\d{2})(\d{2})\.\d{4,5}')
+DOI_YEAR_PATTERN = re.compile(r'[/.\-](20[12]\d)[.\-_]')
+ELSEVIER_PII_PATTERN = re.compile(r'/pii/S\d{4}\d{3}[\dX](\d{2})')
+
+
+def sanitize_filename(filename):
+    """Remove or replace characters that are invalid in filenames."""
+    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = re.sub(r'[_\s]+', '_', filename)
+    filename = filename.strip('_. ')
+    return filename
+
+
+def extract_first_author(title_text):
+    """Extract the first author's last name from the publication text."""
+    match = re.match(r'^([A-Za-zÀ-ÿ\-]+),?\s+[A-Z]\.?', title_text)
+    if match:
+        return match.group(1)
+    
+    match = re.match(r'^([A-Za-zÀ-ÿ\-]+)\s+et\s+al', title_text, re.IGNORECASE)
+    if match:
+        return match.group(1)
+    
+    return None
+
+
+def extract_year(title_text):
+    """Extract year from the title text."""
+    years = re.findall(r'\b(20[12]\d)\b', title_text)
+    if years:
+        return years[0]
+    return None
+
+
+def infer_publication_year(title_text, publication_url=''):
+    """Infer the publication year from the title, falling back to the URL."""
+    year = extract_year(title_text)
+    if year:
+        return int(year)
+
+    match = ARXIV_ID_PATTERN.search(publication_url)
+    if match:
+        return 2000 + int(match.group(1))
+
+    match = ELSEVIER_PII_PATTERN.search(publication_url)
+    if match:
+        return 2000 + int(match.group(1))
+
+    match = DOI_YEAR_PATTERN.search(publication_url)
+    if match:
+        return int(match.group(1))
+
+    return None
+
+
+def extract_title_keywords(title_text):
+    """Extract key words from the title (after author info)."""
+    parts = re.split(r'[,\.](?=[A-Z])', title_text)
+    
+    for part in parts:
+        if len(part) > 20 and not re.match(r'^[A-Z]\.\s*$', part.strip()):
+            title_part = part.strip()
+            words = re.findall(r'\b[A-Z][a-z]+\b', title_part)
+            if len(words) >= 2:
+                return '_'.join(words[:4])
+    
+    words = title_text.split()[:5]
+    return '_'.join(w for w in words if len(w) > 3)[:40]
+
+
+def generate_filename(title_text, url, index):
+    """Generate an informative filename from publication metadata."""
+    author = extract_first_author(title_text)
+    year = extract_year(title_text)
+    keywords = extract_title_keywords(title_text)
+    
+    parts = []
+    if author:
+        parts.append(author)
+    if year:
+        parts.append(year)
+    if keywords:
+        parts.append(keywords)
+    
+    if not parts:
+        parts.append(f"publication_{index:03d}")
+    
+    filename = '_'.join(parts)
+    filename = sanitize_filename(filename)
+    
+    if len(filename) > MAX_FILENAME_LENGTH:
+        filename = filename[:MAX_FILENAME_LENGTH]
+    
+    return filename + '.pdf'
@@ -0,0 +1,174 @@
+"""
+Per-host rate limiting and retry backoff for the scraper and downloaders
+A token bucket per host spaces out requests; 429/503 responses halve that
+host's rate and pause it for Retry-After (or a jittered exponential backoff),
+and successful responses gradually restore the configured rate
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+# Backoff settings
+BASE_BACKOFF = 1.0         # Seconds before the first retry (doubled each attempt)
+MAX_BACKOFF = 60.0         # Cap for computed backoff delays
+MAX_RETRY_AFTER = 120.0    # Cap for server-supplied Retry-After delays
+MIN_RATE_FACTOR = 1 / 16   # Throttled hosts never drop below this fraction of the base rate
+RECOVERY_STEP = 0.1        # Fraction of the base rate regained per successful response
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError
+)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Delay before retry number `attempt` (0-based).
+
+    Exponential backoff with jitter (half fixed, half random) so workers that
+    failed together do not retry in lockstep. A Retry-After value takes
+    precedence, with a little jitter added on top.
+    """
+    if retry_after is not None:
+        return min(retry_after, MAX_RETRY_AFTER) + random.uniform(0, BASE_BACKOFF)
+    delay = min(BASE_BACKOFF * 2 ** attempt, MAX_BACKOFF)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class TokenBucket:
+    """Token bucket for one host; callers reserve a token and sleep off any debt."""
+
+    def __init__(self, rate, burst=1):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now):
+        """Take one token (possibly going into debt) and return the wait in seconds."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+
+class RateLimiter:
+    """
+    Adaptive per-host limiter shared by all worker threads.
+
+    `rate` is requests per second per host and `burst` how many may start
+    back to back; `max_concurrent`, if set, also caps requests in flight per
+    host. Hosts do not wait on each other.
+    """
+
+    def __init__(self, rate, burst=1, max_concurrent=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._semaphores = {}
+        self.retries = 0
+        self.throttled = 0
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url):
+        """Block until the URL's host may receive another request."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            wait = self._bucket(host).reserve(time.monotonic())
+        if wait > 0:
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self, url):
+        """Hold a concurrency slot for the URL's host and wait for a token."""
+        if not self.max_concurrent:
+            self.acquire(url)
+            yield
+            return
+
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_concurrent)
+                self._semaphores[host] = semaphore
+
+        semaphore.acquire()
+        try:
+            self.acquire(url)
+            yield
+        finally:
+            semaphore.release()
+
+    def record_success(self, url):
+        """Additive increase: move the host's rate back toward the base rate."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            bucket = self._bucket(host)
+            if bucket.rate < bucket.base_rate:
+                bucket.rate = min(bucket.base_rate, bucket.rate + bucket.base_rate * RECOVERY_STEP)
+
+    def backoff(self, url, attempt, response=None):
+        """
+        Register a failed attempt and return how long to sleep before retrying.
+
+        For 429/503 the host's rate is halved and the whole host is paused for
+        the delay, so other workers back off too; other errors (5xx,
+        connection resets, timeouts) only delay the failing request.
+        """
+        retry_after = None
+        throttled = response is not None and response.status_code in THROTTLE_STATUSES
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        delay = backoff_delay(attempt, retry_after)
+
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            self.retries += 1
+            if throttled:
+                self.throttled += 1
+                bucket = self._bucket(host)
+                bucket.rate = max(bucket.rate / 2, bucket.base_rate * MIN_RATE_FACTOR)
+                bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+        return delay
+
+    def format_stats(self):
+        """One summary line for the end-of-run report."""
+        with self._lock:
+            slowed = sum(1 for b in self._buckets.values() if b.rate < b.base_rate)
+            return (f"{self.retries} retries, {self.throttled} throttled responses, "
+                    f"{slowed} hosts still slowed down")
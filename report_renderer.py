@@ -0,0 +1,348 @@
+"""
+Landscape Report Renderer
+Regenerates LANDSCAPE_ASSESSMENT_REPORT.md (and optionally an HTML version)
+from the artifacts persisted by landscape_analysis.py, without rerunning the
+analysis or importing the NLP stack
+
+Usage:
+    python report_renderer.py [--html] [--output-folder landscape_analysis_output]
+"""
+
+import argparse
+import csv
+import html
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Configuration
+OUTPUT_FOLDER = "landscape_analysis_output"
+REPORT_NAME = "LANDSCAPE_ASSESSMENT_REPORT.md"
+
+# Charts referenced by the report, in display order
+CHARTS = [
+    ("wordcloud.png", "Word Cloud", "Visual representation of most frequent terms"),
+    ("document_lengths.png", "Document Length Distribution", "Histogram of document sizes"),
+    ("top_words.png", "Top Words Chart", "Bar chart of 20 most common terms"),
+    ("topic_distribution.png", "Topic Distribution", "Distribution of documents across topics"),
+    ("topic_trends.png", "Topic Trends", "Topic prevalence by publication year"),
+]
+
+# Data files listed in the report when present
+DATA_FILES = [
+    ("extracted_texts.json", "Full text of all documents"),
+    ("corpus_statistics.json", "Detailed statistics"),
+    ("topic_assignments.csv", "Document-topic mappings (see below)"),
+    ("topic_prevalence_by_year.csv", "Topic share per publication year"),
+    ("incremental_topic_prevalence_by_year.csv", "Year-by-year incremental topic model"),
+    ("coauthor_nodes.csv", "Author degree, centrality and component"),
+    ("coauthor_edges.csv", "Co-authorship ties with publication counts"),
+]
+
+
+def load_json(path):
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_artifacts(output_folder=OUTPUT_FOLDER):
+    """Collect everything the report needs from the output folder."""
+    output_folder = Path(output_folder)
+    data_folder = output_folder / "data"
+
+    stats = load_json(data_folder / "corpus_statistics.json")
+    if stats is None:
+        raise FileNotFoundError(
+            f"{data_folder / 'corpus_statistics.json'} not found - run landscape_analysis.py first"
+        )
+
+    assignments = []
+    assignments_path = data_folder / "topic_assignments.csv"
+    if assignments_path.exists():
+        with open(assignments_path, 'r', encoding='utf-8') as f:
+            assignments = [
+                {'filename': row['filename'], 'topic': int(row['topic'])}
+                for row in csv.DictReader(f)
+            ]
+
+    return {
+        'output_folder': output_folder,
+        'stats': stats,
+        'assignments': assignments,
+        'topic_terms': load_json(data_folder / "topic_terms.json"),
+        'policy_scores': load_json(data_folder / "policy_scores.json"),
+        'temporal': load_json(data_folder / "temporal_analysis.json"),
+        'network': load_json(data_folder / "coauthor_network.json"),
+        'charts': [chart for chart in CHARTS if (output_folder / "visualizations" / chart[0]).exists()],
+        'data_files': [entry for entry in DATA_FILES if (data_folder / entry[0]).exists()],
+    }
+
+
+def render_markdown(artifacts):
+    """Render the landscape assessment report as Markdown text."""
+    stats = artifacts['stats']
+    lines = []
+    w = lines.append
+
+    w("# AI Research Landscape Assessment\n")
+    w("## HUMAINT Publications Analysis\n\n")
+    w(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    approximate = stats.get('approximate')
+    if approximate:
+        pages = approximate.get('pages')
+        budget = "all pages" if pages is None else \
+            f"the first {pages} pages plus {approximate.get('random_pages', 0)} random pages"
+        available = approximate.get('documents_available')
+        w(f"> **APPROXIMATE RESULTS (preview mode).** Based on {approximate['documents_sampled']} ")
+        w(f"of {available if available is not None else 'the'} documents and {budget} of each; ")
+        w("counts, statistics and topics are estimates from that sample.\n\n")
+    w("---\n\n")
+
+    # Executive Summary
+    w("## Executive Summary\n\n")
+    sampled = " (sampled, approximate)" if approximate else ""
+    w(f"This landscape assessment analyzes **{stats['total_documents']} research publications**{sampled} ")
+    w(f"from the European Commission's HUMAINT initiative on AI and society.\n\n")
+    w(f"- **Total corpus size:** {stats['total_words']:,} words\n")
+    w(f"- **Unique terms:** {stats['unique_words']:,}\n")
+    w(f"- **Average document length:** {stats['avg_words_per_doc']:.0f} words\n")
+    w(f"- **Document range:** {stats['min_words']:,} to {stats['max_words']:,} words\n\n")
+
+    # Key Themes
+    w("## Key Research Themes\n\n")
+    w("Based on frequency analysis, the most prominent themes include:\n\n")
+    for i, (word, count) in enumerate(stats['top_20_words'][:10], 1):
+        w(f"{i}. **{word.title()}** ({count:,} occurrences)\n")
+    w("\n")
+
+    # Topic Analysis
+    topic_terms = artifacts['topic_terms']
+    if topic_terms:
+        w("## Discovered Research Topics\n\n")
+        if topic_terms['method'] == 'bertopic':
+            for topic_id, terms in topic_terms['topics'].items():
+                topic_docs = [
+                    doc['filename'] for doc in artifacts['assignments']
+                    if doc['topic'] == int(topic_id)
+                ]
+                w(f"### Topic {topic_id}\n\n")
+                w(f"**Key terms:** {', '.join(terms[:8])}\n\n")
+                w(f"**Documents in this topic:** {len(topic_docs)}\n\n")
+                if topic_docs:
+                    w("**Example publications:**\n")
+                    for doc in topic_docs[:3]:
+                        w(f"- {doc}\n")
+                w("\n")
+        else:
+            w("*Traditional LDA topic modeling was used. ")
+            w("For better results, install BERTopic: `pip install bertopic sentence-transformers`*\n\n")
+
+    # Temporal Trends
+    temporal = artifacts['temporal']
+    if temporal:
+        w("## Temporal Trends\n\n")
+        w("Topic prevalence per publication year (share of that year's documents):\n\n")
+        if temporal.get('approximate'):
+            w("*Approximate: computed from the preview sample.*\n\n")
+        prevalence = temporal['prevalence']
+        topic_ids = sorted({t for row in prevalence.values() for t in row}, key=int)
+        w("| Year | Documents | " + " | ".join(f"Topic {t}" for t in topic_ids) + " |\n")
+        w("|" + "---|" * (len(topic_ids) + 2) + "\n")
+        for year in temporal['years']:
+            row = prevalence[str(year)]
+            shares = " | ".join(f"{row.get(t, 0):.0%}" for t in topic_ids)
+            w(f"| {year} | {temporal['documents_per_year'][str(year)]} | {shares} |\n")
+        w("\n![Topic Trends](visualizations/topic_trends.png)\n\n")
+
+    # Collaboration Network
+    network = artifacts['network']
+    if network:
+        w("## Collaboration Network\n\n")
+        w(f"The catalog lists **{network['authors']} authors** across {network['publications']} publications, ")
+        w(f"linked by **{network['collaborations']} co-authorship ties**. ")
+        w(f"The largest connected group contains {network['largest_component_size']} authors ")
+        w(f"({network['components']} separate groups in total).\n\n")
+        if network.get('approximate'):
+            w("*Written by a preview run; treat as approximate.*\n\n")
+        w("**Most central authors** (eigenvector centrality):\n\n")
+        for author in network['top_authors'][:10]:
+            w(f"- {author['author']} - {author['papers']} publications, {author['coauthors']} co-authors\n")
+        w("\n")
+
+    # Research Areas for Public Policy
+    w("## Key Areas for Public Policy Students\n\n")
+    w("Based on this landscape analysis, the following research areas are prominent:\n\n")
+    for area, entry in (artifacts['policy_scores'] or {}).items():
+        if entry['score'] > 50:  # Only include if significant presence
+            w(f"### {area}\n")
+            w(f"*Relevance score: {entry['score']} term occurrences*\n\n")
+            w(f"This area focuses on {', '.join(entry['terms'][:4])} and related concepts.\n\n")
+
+    # Visualizations
+    if artifacts['charts']:
+        w("## Visualizations\n\n")
+        w("The following visualizations are available in the `visualizations/` folder:\n\n")
+        for i, (_, title, description) in enumerate(artifacts['charts'], 1):
+            w(f"{i}. **{title}** - {description}\n")
+        w("\n")
+        if any(chart[0] == "wordcloud.png" for chart in artifacts['charts']):
+            w("![Word Cloud](visualizations/wordcloud.png)\n\n")
+
+    # Recommendations
+    w("## Recommendations for Further Research\n\n")
+    w("1. **Deep Dive into Specific Topics** - Use the topic assignments to cluster related research\n")
+    w("2. **Citation Network Analysis** - Map relationships between publications\n")
+    w("3. **Temporal Analysis** - Track evolution of themes over time\n")
+    w("4. **Policy Gap Analysis** - Identify under-researched policy areas\n")
+    w("5. **Stakeholder Mapping** - Analyze author networks and institutional affiliations\n\n")
+
+    # Data Files
+    w("## Available Data Files\n\n")
+    for filename, description in artifacts['data_files']:
+        w(f"- `data/{filename}` - {description}\n")
+    w("\n")
+
+    # Footer
+    w("---\n\n")
+    w("*This assessment was generated using state-of-the-art NLP techniques ")
+    w("including BERTopic and transformer-based models.*\n")
+
+    return "".join(lines)
+
+
+def render_inline(text):
+    """Inline Markdown used by the report: code, bold, italics."""
+    text = html.escape(text, quote=False)
+    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', text)
+    return text
+
+
+def markdown_to_html(markdown_text, title="AI Research Landscape Assessment"):
+    """
+    Convert the report's Markdown to a standalone HTML page.
+
+    Only the constructs `render_markdown` emits are handled: headings,
+    paragraphs, ordered/unordered lists, tables, images and rules.
+    """
+    body = []
+    list_tag = None
+    table_rows = []
+
+    def close_blocks():
+        nonlocal list_tag, table_rows
+        if list_tag:
+            body.append(f"</{list_tag}>")
+            list_tag = None
+        if table_rows:
+            header, rows = table_rows[0], table_rows[2:]
+            body.append("<table>")
+            body.append("<tr>" + "".join(f"<th>{render_inline(c)}</th>" for c in header) + "</tr>")
+            for row in rows:
+                body.append("<tr>" + "".join(f"<td>{render_inline(c)}</td>" for c in row) + "</tr>")
+            body.append("</table>")
+            table_rows = []
+
+    for line in markdown_text.splitlines():
+        stripped = line.strip()
+
+        if stripped.startswith('|'):
+            if list_tag:
+                body.append(f"</{list_tag}>")
+                list_tag = None
+            table_rows.append([cell.strip() for cell in stripped.strip('|').split('|')])
+            continue
+
+        ordered = re.match(r'^\d+\.\s+(.*)', stripped)
+        if stripped.startswith('- ') or ordered:
+            tag = 'ol' if ordered else 'ul'
+            if list_tag != tag:
+                close_blocks()
+                body.append(f"<{tag}>")
+                list_tag = tag
+            item = ordered.group(1) if ordered else stripped[2:]
+            body.append(f"<li>{render_inline(item)}</li>")
+            continue
+
+        close_blocks()
+        if not stripped:
+            continue
+
+        heading = re.match(r'^(#{1,6})\s+(.*)', stripped)
+        image = re.match(r'^!\[([^\]]*)\]\(([^)]+)\)$', stripped)
+        if heading:
+            level = len(heading.group(1))
+            body.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+        elif image:
+            body.append(
+                f'<p><img src="{html.escape(image.group(2))}" alt="{html.escape(image.group(1))}"></p>'
+            )
+        elif stripped == '---':
+            body.append("<hr>")
+        else:
+            body.append(f"<p>{render_inline(stripped)}</p>")
+
+    close_blocks()
+
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n"
+        "<style>\n"
+        "body { font-family: system-ui, sans-serif; max-width: 960px; margin: 2rem auto; "
+        "padding: 0 1rem; line-height: 1.5; color: #222; }\n"
+        "img { max-width: 100%; }\n"
+        "table { border-collapse: collapse; margin: 1rem 0; }\n"
+        "th, td { border: 1px solid #ccc; padding: 0.3rem 0.6rem; text-align: right; }\n"
+        "th:first-child, td:first-child { text-align: left; }\n"
+        "code { background: #f3f3f3; padding: 0 0.2rem; }\n"
+        "</style>\n</head>\n<body>\n"
+        + "\n".join(body)
+        + "\n</body>\n</html>\n"
+    )
+
+
+def write_report(output_folder=OUTPUT_FOLDER, html_output=False, artifacts=None):
+    """
+    Render the report; returns the Markdown path.
+
+    `artifacts` (in load_artifacts' layout) is what an analysis run just
+    produced; without it the persisted artifacts are read back from disk.
+    """
+    output_folder = Path(output_folder)
+    if artifacts is None:
+        artifacts = load_artifacts(output_folder)
+    markdown_text = render_markdown(artifacts)
+
+    report_path = output_folder / REPORT_NAME
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(markdown_text)
+
+    if html_output:
+        with open(report_path.with_suffix('.html'), 'w', encoding='utf-8') as f:
+            f.write(markdown_to_html(markdown_text))
+
+    return report_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the landscape report from saved artifacts")
+    parser.add_argument('--output-folder', default=OUTPUT_FOLDER)
+    parser.add_argument('--html', action='store_true', help="also write an HTML version")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report_path = write_report(args.output_folder, html_output=args.html)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Report saved to: {report_path} ({elapsed_ms:.0f} ms)")
+    if args.html:
+        print(f"HTML report saved to: {report_path.with_suffix('.html')}")
+
+
+if __name__ == "__main__":
+    main()
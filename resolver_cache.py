@@ -0,0 +1,86 @@
+"""
+Persistent cache of publication page -> PDF URL resolutions
+Lets repeat downloader runs skip page scraping for publications that were
+already resolved; entries are tagged with the resolver version so a change
+to the resolution rules invalidates them, and negative results expire
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+CACHE_NAME = "resolver_cache.json"
+NEGATIVE_TTL = 7 * 24 * 3600   # Seconds before a "no PDF found" result is retried
+
+
+class ResolverCache:
+    """
+    JSON cache keyed by publication URL, safe to share between threads.
+
+    Each entry stores the resolved PDF URL (None for a negative result), when
+    it was resolved and the resolver version that produced it.
+    """
+
+    def __init__(self, path, version, negative_ttl=NEGATIVE_TTL):
+        self.path = Path(path)
+        self.version = version
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            # Results from other resolver versions are never trusted
+            self.entries = {
+                url: entry for url, entry in entries.items()
+                if entry.get('version') == version
+            }
+
+    def lookup(self, publication_url):
+        """Return (hit, pdf_url); pdf_url is None for a cached negative result."""
+        with self._lock:
+            entry = self.entries.get(publication_url)
+            if entry is not None and entry['pdf_url'] is None:
+                if time.time() - entry['resolved_at'] > self.negative_ttl:
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, entry['pdf_url']
+
+    def store(self, publication_url, pdf_url):
+        with self._lock:
+            self.entries[publication_url] = {
+                'pdf_url': pdf_url,
+                'resolved_at': time.time(),
+                'version': self.version
+            }
+            self._save()
+
+    def invalidate(self, publication_url):
+        """Forget a resolution, e.g. when the cached PDF URL stopped working."""
+        with self._lock:
+            if self.entries.pop(publication_url, None) is not None:
+                self._save()
+
+    def clear(self):
+        """Drop every cached resolution (forces pages to be scraped again)."""
+        with self._lock:
+            self.entries.clear()
+            self._save()
+
+    def format_stats(self):
+        """One summary line for the end-of-run report."""
+        with self._lock:
+            return f"{self.hits} hits, {self.misses} misses"
+
+    def _save(self):
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,242 @@
+"""
+Temporal Analysis of Research Themes
+Tracks how topic prevalence evolves across publication years by joining the
+publication catalog with the per-document topic assignments
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+import matplotlib.pyplot as plt
+
+from publication_catalog import load_catalog
+
+# Configuration
+CSV_FILE = "ai_watch_publications.csv"
+OUTPUT_FOLDER = "landscape_analysis_output"
+
+
+def load_publication_years(csv_file=CSV_FILE):
+    """Map each downloaded PDF filename to its publication year."""
+    # Filenames follow the downloader's naming scheme, so they line up
+    years = load_catalog(csv_file, columns=['filename', 'year']).dropna(subset=['year'])
+    years['year'] = years['year'].astype(int)
+    return years.drop_duplicates(subset='filename')
+
+
+class TemporalTopicAnalyzer:
+    """Compute topic prevalence per publication year."""
+
+    def __init__(self, output_folder=OUTPUT_FOLDER, n_topics=8, min_warmup_docs=10):
+        self.output_folder = Path(output_folder)
+        self.n_topics = n_topics
+        self.min_warmup_docs = min_warmup_docs
+        self.vectorizer = None
+        self.model = None
+
+    def join_years(self, documents, years):
+        """Attach publication years to documents (inner join on filename)."""
+        merged = documents.merge(years, on='filename', how='inner')
+        return merged.sort_values('year').reset_index(drop=True)
+
+    def compute_prevalence(self, merged):
+        """Share of documents per topic for each year, from the fitted assignments."""
+        counts = merged.groupby(['year', 'topic']).size().unstack(fill_value=0)
+        prevalence = counts.div(counts.sum(axis=1), axis=0)
+        return counts, prevalence
+
+    def fit_incremental(self, merged, text_column='processed_text'):
+        """
+        Fit a topic model slice by slice in chronological order.
+
+        The vocabulary is learned once on a warm-up window made of the earliest
+        years (at least `min_warmup_docs` documents); every later year is
+        vectorized with that vocabulary and folded into the same online LDA
+        model with `partial_fit`, so no slice triggers a refit from scratch.
+        """
+        slices = [(year, group) for year, group in merged.groupby('year', sort=True)]
+        if not slices:
+            return None
+
+        # Warm-up window: earliest slices until enough documents are available
+        warmup_end = 0
+        warmup_docs = 0
+        while warmup_end < len(slices) and warmup_docs < self.min_warmup_docs:
+            warmup_docs += len(slices[warmup_end][1])
+            warmup_end += 1
+
+        warmup_texts = pd.concat([group for _, group in slices[:warmup_end]])[text_column]
+        for max_df in (0.9, 1.0):
+            vectorizer = CountVectorizer(
+                max_features=1000,
+                max_df=max_df,
+                min_df=1,
+                stop_words='english'
+            )
+            try:
+                self.vectorizer = vectorizer.fit(warmup_texts)
+                break
+            except ValueError:
+                # Tiny warm-up sets (a single document, say): every term is in
+                # more than 90% of them, so retry without the max_df cut
+                continue
+        else:
+            print(f"  Skipping incremental topic model: no usable terms in the "
+                  f"{len(warmup_texts)} warm-up documents")
+            return None
+
+        self.model = LatentDirichletAllocation(
+            n_components=self.n_topics,
+            learning_method='online',
+            total_samples=len(merged),
+            random_state=42
+        )
+
+        # Warm-up slices are folded in together; later slices one at a time
+        self.model.partial_fit(self.vectorizer.transform(warmup_texts))
+
+        doc_topics = []
+        for i, (year, group) in enumerate(slices):
+            matrix = self.vectorizer.transform(group[text_column])
+            if i >= warmup_end:
+                self.model.partial_fit(matrix)
+            doc_topics.append(self.model.transform(matrix))
+
+        distribution = pd.DataFrame(
+            np.vstack(doc_topics),
+            columns=[f"topic_{t}" for t in range(self.n_topics)]
+        )
+        distribution['year'] = np.concatenate([
+            np.full(len(group), year) for year, group in slices
+        ])
+        return distribution.groupby('year').mean()
+
+    def get_topic_terms(self, top_n=8):
+        """Top terms per incrementally fitted topic."""
+        if self.model is None:
+            return {}
+        feature_names = self.vectorizer.get_feature_names_out()
+        top = np.argsort(self.model.components_, axis=1)[:, ::-1][:, :top_n]
+        return {
+            f"topic_{t}": [feature_names[j] for j in row]
+            for t, row in enumerate(top)
+        }
+
+    def plot_trends(self, prevalence, path, title):
+        """Line chart of topic prevalence by year."""
+        plt.figure(figsize=(12, 6))
+        for column in prevalence.columns:
+            plt.plot(prevalence.index, prevalence[column], marker='o', label=f"Topic {column}")
+        plt.xlabel('Publication Year', fontsize=12)
+        plt.ylabel('Share of Documents', fontsize=12)
+        plt.title(title, fontsize=14)
+        plt.xticks(prevalence.index)
+        plt.legend(bbox_to_anchor=(1.02, 1), loc='upper left')
+        plt.grid(alpha=0.3)
+        plt.tight_layout()
+        plt.savefig(path, dpi=300, bbox_inches='tight')
+        plt.close()
+
+    def run(self, documents, years, approximate=None):
+        """
+        Run the full temporal stage.
+
+        `documents` is a DataFrame with `filename`, `topic` and
+        `processed_text` columns; `years` comes from `load_publication_years`.
+        `approximate` (preview settings) is stored with the results and marks
+        the charts as sample-based.
+        """
+        print("\nRunning temporal analysis...")
+        data_folder = self.output_folder / "data"
+        viz_folder = self.output_folder / "visualizations"
+        data_folder.mkdir(parents=True, exist_ok=True)
+        viz_folder.mkdir(parents=True, exist_ok=True)
+
+        merged = self.join_years(documents, years)
+        unmatched = sorted(set(documents['filename']) - set(merged['filename']))
+        if merged.empty:
+            print(f"  None of the {len(documents)} documents could be matched to a publication year")
+            return None
+
+        print(f"  Matched {len(merged)} of {len(documents)} documents to a publication year "
+              f"across {merged['year'].nunique()} years ({len(unmatched)} unmatched)")
+        if unmatched:
+            shown = ", ".join(unmatched[:5])
+            print(f"  Unmatched: {shown}{', ...' if len(unmatched) > 5 else ''}")
+
+        suffix = " (approximate, preview sample)" if approximate else ""
+        counts, prevalence = self.compute_prevalence(merged)
+        counts.to_csv(data_folder / "topic_counts_by_year.csv")
+        prevalence.round(4).to_csv(data_folder / "topic_prevalence_by_year.csv")
+        self.plot_trends(prevalence, viz_folder / "topic_trends.png", 'Topic Prevalence by Year' + suffix)
+
+        results = {
+            'documents_matched': len(merged),
+            'documents_unmatched': len(unmatched),
+            'years': [int(y) for y in prevalence.index],
+            # String year keys, as they read back from temporal_analysis.json
+            'documents_per_year': {str(int(y)): int(n) for y, n in counts.sum(axis=1).items()},
+            'prevalence': {
+                str(int(y)): {str(t): round(float(v), 4) for t, v in row.items()}
+                for y, row in prevalence.iterrows()
+            }
+        }
+
+        if 'processed_text' in merged.columns:
+            incremental = self.fit_incremental(merged)
+            if incremental is not None:
+                incremental.round(4).to_csv(data_folder / "incremental_topic_prevalence_by_year.csv")
+                self.plot_trends(
+                    incremental,
+                    viz_folder / "incremental_topic_trends.png",
+                    'Incrementally Fitted Topic Prevalence by Year' + suffix
+                )
+                results['incremental_topic_terms'] = self.get_topic_terms()
+        if approximate:
+            results['approximate'] = approximate
+
+        with open(data_folder / "temporal_analysis.json", 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+        print(f"  Temporal trends saved to {viz_folder}/topic_trends.png")
+        return results
+
+
+def main():
+    """Run the temporal stage from saved analysis outputs."""
+    data_folder = Path(OUTPUT_FOLDER) / "data"
+    assignments_path = data_folder / "topic_assignments.csv"
+    texts_path = data_folder / "extracted_texts.json"
+
+    if not assignments_path.exists():
+        print(f"[ERROR] {assignments_path} not found - run landscape_analysis.py first")
+        return
+
+    documents = pd.read_csv(assignments_path)
+    if texts_path.exists():
+        # Imported here: landscape_analysis imports this module
+        from landscape_analysis import TextPreprocessor
+
+        # The saved texts are raw; preprocess them as landscape_analysis does
+        preprocessor = TextPreprocessor()
+        with open(texts_path, 'r', encoding='utf-8') as f:
+            texts = pd.DataFrame(
+                [
+                    {'filename': doc['filename'], 'processed_text': preprocessor.preprocess(doc['text'])}
+                    for doc in json.load(f)
+                ],
+                columns=['filename', 'processed_text']
+            )
+        documents = documents.merge(texts, on='filename', how='left')
+        documents['processed_text'] = documents['processed_text'].fillna('')
+
+    analyzer = TemporalTopicAnalyzer(OUTPUT_FOLDER)
+    analyzer.run(documents, load_publication_years(CSV_FILE))
+
+
+if __name__ == "__main__":
+    main()